@@ -0,0 +1,221 @@
+"""
+Analytics Figures
+=================
+Aggregates and Plotly figure specs for the Analytics page.
+
+Building the figures is the expensive part of the page, so the results are
+cached per session against the ``version`` counter that ``update_stats``
+bumps. Reruns that do not add a game (revisiting the page, touching another
+widget) get the cached specs back instead of rebuilding them.
+
+The cumulative score line is downsampled with Largest-Triangle-Three-Buckets
+to at most ``LINE_POINT_BUDGET`` points, so its spec (and the browser's work)
+stays the same size however long the history gets. Score quantiles come from
+the per-game streaming sketches instead of sorting every score.
+"""
+
+import numpy as np
+import streamlit as st
+
+import metrics
+
+# Bounded cache shared by all sessions; least recently used entries are
+# evicted first, and idle entries expire after the TTL.
+FIGURE_CACHE_MAX_ENTRIES = 128
+FIGURE_CACHE_TTL = 60 * 60  # seconds; a string TTL would make Streamlit import pandas
+
+LINE_POINT_BUDGET = 500
+QUANTILES = (0.5, 0.95)
+
+
+def lttb(x, y, n_out: int = LINE_POINT_BUDGET):
+    """Largest-Triangle-Three-Buckets downsampling of a line to ``n_out`` points.
+
+    Keeps the first and last points. The points in between are split into
+    ``n_out - 2`` equal buckets, and from each bucket the point forming the
+    largest triangle with the previously kept point and the next bucket's
+    mean is kept, which preserves the line's peaks and dips. Returns the
+    ``(x, y)`` arrays unchanged when there are no more than ``n_out`` points.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return x, y
+    xf = x.astype(np.float64)
+    yf = y.astype(np.float64)
+    # Bucket i holds points edges[i]:edges[i + 1]; the last point is its own bucket
+    edges = np.append(np.linspace(1, n - 1, n_out - 1).astype(np.int64), n)
+    # Every bucket's mean up front, so the sequential loop is one argmax per bucket
+    sizes = np.diff(edges)
+    mean_x = np.add.reduceat(xf, edges[:-1]) / sizes
+    mean_y = np.add.reduceat(yf, edges[:-1]) / sizes
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        px, py = xf[previous], yf[previous]
+        nx, ny = mean_x[i + 1], mean_y[i + 1]
+        area = np.abs((px - nx) * (yf[start:stop] - py) - (px - xf[start:stop]) * (ny - py))
+        previous = keep[i + 1] = start + int(area.argmax())
+    return x[keep], y[keep]
+
+
+@metrics.timed("analytics_figures_seconds")
+def _build_figures(game_names, game_counts, timestamps_ms, cumulative_scores, recent_df,
+                   quantiles, activity_ms, activity_counts):
+    """Turn precomputed aggregates into the figure specs for the page.
+
+    Figures are built with graph objects and a layout given up front;
+    Plotly Express applies its template through many layout updates, which
+    cost about ten times as much per figure.
+    """
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+
+    # Games played by type
+    names = list(game_names)
+    fig_pie = go.Figure(
+        go.Pie(
+            values=game_counts,
+            labels=names,
+            marker_colors=[qualitative.Set3[i % len(qualitative.Set3)] for i in range(len(names))],
+            textposition='inside',
+            textinfo='percent+label'
+        ),
+        layout=dict(title="🎯 Games Played by Type")
+    )
+
+    # Score progression over time
+    timestamps_ms, cumulative_scores = lttb(
+        np.asarray(timestamps_ms, dtype=np.int64), cumulative_scores
+    )
+    fig_line = go.Figure(
+        go.Scatter(x=timestamps_ms.view('datetime64[ms]'), y=cumulative_scores, mode='lines+markers'),
+        layout=dict(
+            title='📈 Score Progression Over Time',
+            xaxis_title="Time",
+            yaxis_title="Cumulative Score",
+            showlegend=False
+        )
+    )
+
+    # Typical and high scores per game
+    games = list(quantiles)
+    fig_quantiles = go.Figure(
+        [
+            go.Bar(name=f"p{round(q * 100)}", x=games, y=[quantiles[game][i] for game in games])
+            for i, q in enumerate(QUANTILES)
+        ],
+        layout=dict(
+            title="🏅 Score Percentiles by Game",
+            barmode='group',
+            xaxis_title="Game",
+            yaxis_title="Score"
+        )
+    )
+
+    # Games played per time bucket
+    fig_activity = go.Figure(
+        go.Bar(x=np.asarray(activity_ms, dtype=np.int64).view('datetime64[ms]'), y=activity_counts),
+        layout=dict(
+            title="⏱️ Games Played Over Time",
+            xaxis_title="Time",
+            yaxis_title="Games",
+            showlegend=False
+        )
+    )
+
+    return {
+        'pie': fig_pie.to_dict(),
+        'line': fig_line.to_dict(),
+        'quantiles': fig_quantiles.to_dict(),
+        'activity': fig_activity.to_dict(),
+        'recent': recent_df,
+    }
+
+
+@metrics.timed("analytics_build_seconds", source="history")
+def build_analytics_figures(history):
+    """Compute the analytics aggregates and figure specs for a play history.
+
+    Returns a dict with the ``pie``, ``line``, ``quantiles`` and
+    ``activity`` figure specs (plain dicts, ready for ``st.plotly_chart``)
+    and the ``recent`` games DataFrame.
+    """
+    # Exact even for bounded histories: rolled-up records are included
+    game_counts = history.game_counts()
+    timestamps, cumulative_scores = history.cumulative_series()
+    hours, plays = history.hourly_series()
+    with metrics.timer("analytics_frame_seconds"):
+        recent_df = history.to_frame(last=10).iloc[::-1]
+    return _build_figures(
+        history.game_names, game_counts, timestamps, cumulative_scores,
+        recent_df[['game', 'score', 'timestamp']],
+        history.score_quantiles(QUANTILES), hours, plays
+    )
+
+
+@metrics.timed("analytics_build_seconds", source="store")
+def build_store_figures(store, player):
+    """Same as ``build_analytics_figures``, from a ``SQLiteStatsStore``.
+
+    Only aggregate queries are run: per-game totals, per-game score counts
+    (folded into the same sketches the history keeps), a time-bucketed
+    score series and the last ten records. Pending writes are flushed first so
+    the figures include this session's latest games.
+    """
+    import pandas as pd
+
+    from history import ScoreSketch
+
+    store.flush()
+    totals = store.game_totals(player)
+    quantiles = {}
+    for game, counts in store.score_counts(player).items():
+        sketch = ScoreSketch()
+        for score, plays in counts:
+            sketch.add(score, plays)
+        quantiles[game] = tuple(sketch.quantile(q) for q in QUANTILES)
+    series = np.array(store.score_series(player), dtype=np.int64).reshape(-1, 3)
+    recent = store.recent(player)
+    recent_df = pd.DataFrame({
+        'game': [game for game, _, _ in recent],
+        'score': [score for _, score, _ in recent],
+        'timestamp': np.array([ts for _, _, ts in recent], dtype=np.int64).view('datetime64[ms]'),
+    })
+    return _build_figures(
+        list(totals), [t.plays for t in totals.values()], series[:, 0],
+        np.cumsum(series[:, 2]), recent_df,
+        {game: quantiles[game] for game in totals if game in quantiles}, series[:, 0], series[:, 1]
+    )
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_MAX_ENTRIES, ttl=FIGURE_CACHE_TTL, show_spinner=False)
+def cached_analytics_figures(session_id, version, _history):
+    """Version-keyed wrapper around ``build_analytics_figures``.
+
+    Only ``session_id`` and ``version`` form the cache key; the history
+    itself is skipped from hashing (leading underscore), which is safe
+    because every change to it bumps ``version``.
+    """
+    return build_analytics_figures(_history)
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_MAX_ENTRIES, ttl=FIGURE_CACHE_TTL, show_spinner=False)
+def cached_store_figures(player, session_id, version, _store):
+    """Version-keyed wrapper around ``build_store_figures``"""
+    return build_store_figures(_store, player)
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_MAX_ENTRIES, ttl=FIGURE_CACHE_TTL, show_spinner=False)
+def cached_file_figures(file_id, max_records, _source):
+    """Figures for an exported history file, keyed by the upload's ``file_id``.
+
+    The file is streamed into a ``PlayHistory`` bounded by ``max_records``
+    and then goes through ``build_analytics_figures`` like live data.
+    """
+    import history_io
+
+    return build_analytics_figures(history_io.import_history(_source, max_records=max_records))
@@ -0,0 +1,99 @@
+"""
+Theme Assets
+============
+Builds the app's stylesheet from ``static/theme.css`` and injects it once
+per browser session.
+
+The source file is minified and content-hashed once per process. On a
+session's first run a zero-height component adds the stylesheet to the
+page's ``<head>`` as ``<style id="minigames-theme-<hash>">``; the style
+outlives the component, so later reruns send no CSS at all. A new hash
+(the theme changed and the server restarted) replaces the old style.
+
+Poppins comes from the Google Fonts stylesheet, added by the same script
+as a ``<link>`` (``display=swap``) rather than an ``@import`` inside the
+theme, so it never holds up the theme and is also added once per session.
+"""
+
+import hashlib
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+import streamlit as st
+
+STATIC_DIR = Path(__file__).parent / "static"
+THEME_FILE = STATIC_DIR / "theme.css"
+STYLE_ID_PREFIX = "minigames-theme-"
+FONTS_URL = "https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;600;700&display=swap"
+FONTS_LINK_ID = "minigames-fonts"
+
+# Quoted strings are kept verbatim; everything else is fair game
+_CSS_TOKENS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|(/\*.*?\*/)|([^"\'/]+|/)', re.S)
+
+
+class Theme(NamedTuple):
+    css: str
+    digest: str         # first 12 hex digits of the SHA-256 of ``css``
+
+    @property
+    def style_id(self) -> str:
+        return STYLE_ID_PREFIX + self.digest
+
+
+def minify_css(source: str) -> str:
+    """Drop comments and redundant whitespace, leaving quoted strings alone"""
+    parts = []
+    for string, comment, code in _CSS_TOKENS.findall(source):
+        if string:
+            parts.append(string)
+        elif code:
+            code = re.sub(r'\s+', ' ', code)
+            code = re.sub(r'\s*([{};,>])\s*', r'\1', code)
+            # Not before ':', where a space separates "div :hover" from "div:hover"
+            code = re.sub(r':\s+', ':', code)
+            parts.append(code.replace(';}', '}'))
+    return ''.join(parts).strip()
+
+
+@lru_cache(maxsize=None)
+def load_theme(path: Path = THEME_FILE) -> Theme:
+    """Minified, hashed theme; built once per process"""
+    css = minify_css(Path(path).read_text(encoding="utf-8"))
+    return Theme(css, hashlib.sha256(css.encode("utf-8")).hexdigest()[:12])
+
+
+def injector_html(theme: Theme) -> str:
+    """Script that installs ``theme`` and the font stylesheet in the parent page unless already there"""
+    # JSON is a valid JS string literal; "</" must not end the script early
+    css = json.dumps(theme.css).replace("</", "<\\/")
+    return f"""<script>
+const doc = window.parent.document;
+if (!doc.getElementById("{theme.style_id}")) {{
+    doc.querySelectorAll('style[id^="{STYLE_ID_PREFIX}"]').forEach((old) => old.remove());
+    const style = doc.createElement("style");
+    style.id = "{theme.style_id}";
+    style.textContent = {css};
+    doc.head.appendChild(style);
+}}
+if (!doc.getElementById("{FONTS_LINK_ID}")) {{
+    const link = doc.createElement("link");
+    link.id = "{FONTS_LINK_ID}";
+    link.rel = "stylesheet";
+    link.href = "{FONTS_URL}";
+    doc.head.appendChild(link);
+}}
+</script>"""
+
+
+def inject_theme(theme: Theme = None):
+    """Send the theme on the session's first run only"""
+    theme = theme or load_theme()
+    if st.session_state.get('theme_digest') == theme.digest:
+        return
+    import streamlit.components.v1 as components  # deferred: only needed once per session
+
+    components.html(injector_html(theme), height=0)
+    st.session_state.theme_digest = theme.digest
@@ -0,0 +1,220 @@
+"""
+Micro-benchmarks
+================
+Timings for the game and stats hot paths, with JSON baselines.
+
+    python benchmarks.py                           # run and print
+    python benchmarks.py --save bench_baseline.json
+    python benchmarks.py --compare bench_baseline.json --threshold 0.25
+
+Each benchmark reports the best per-call time over several repeats (the
+minimum is the least noisy estimate on a shared machine). ``--compare``
+exits with status 1 when any benchmark is slower than its baseline by more
+than the threshold, so it can gate CI.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+ROOT = Path(__file__).parent
+DEFAULT_THRESHOLD = 0.25    # fractional slowdown that counts as a regression
+HISTORY_SIZES = (1_000, 10_000, 100_000)
+GAMES = ('Number Guessing', 'Rock Paper Scissors', 'Word Scramble', 'Quiz Game', 'Tic-Tac-Toe')
+
+IMPORT_PROBE = """
+import time
+import streamlit
+start = time.perf_counter()
+import main
+print(time.perf_counter() - start)
+"""
+
+
+def measure(func: Callable[[], object], repeat: int = 5, min_time: float = 0.05) -> Tuple[float, int]:
+    """Best seconds per call of ``func`` over ``repeat`` timed batches"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best, number
+
+
+def quiet_streamlit():
+    # Outside `streamlit run` every session state access logs a warning,
+    # which would dominate the timings
+    import streamlit  # noqa: F401  (sets up the streamlit loggers)
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+
+def seeded_app(size: int, history_limit: int = None):
+    """A fresh app session with ``size`` games already recorded.
+
+    ``history_limit`` replaces the session's history bound (normally
+    ``MINIGAMES_HISTORY_LIMIT``).
+    """
+    import streamlit as st
+    from history import PlayHistory
+    from main import StreamlitMiniGames
+
+    st.session_state.clear()
+    app = StreamlitMiniGames()
+    if history_limit is not None:
+        st.session_state.game_stats['play_history'] = PlayHistory(max_records=history_limit)
+    rng = random.Random(size)
+    for _ in range(size):
+        app.update_stats(rng.choice(GAMES), rng.randrange(0, 101, 5))
+    return app
+
+
+def bench_update_stats(size: int):
+    # Every timed call appends, so start from a full ring of ``size``
+    # records: appending then evicts one, and the history measured stays
+    # at ``size`` records however many calls measure() makes
+    app = seeded_app(size, history_limit=size)
+    return lambda: app.update_stats('Quiz Game', 10)
+
+
+def bench_check_ttt_winner():
+    import engine
+    boards = [
+        ['X', 'X', 'X', 'O', 'O', ' ', ' ', ' ', ' '],
+        ['X', 'O', 'X', 'X', 'O', 'O', 'O', 'X', 'X'],
+        [' '] * 9,
+        ['O', 'X', ' ', 'X', 'O', ' ', ' ', ' ', 'O'],
+    ]
+    return lambda: [engine.check_ttt_winner(board) for board in boards]
+
+
+def bench_scramble_word(word: str):
+    import engine
+    rng = random.Random(0)
+    return lambda: engine.scramble_word(word, rng)
+
+
+def bench_analytics_frame(size: int):
+    import streamlit as st
+    seeded_app(size)
+    history = st.session_state.game_stats['play_history']
+    return lambda: history.to_frame(last=10).iloc[::-1]
+
+
+def bench_analytics_figures(size: int):
+    import streamlit as st
+    from analytics import build_analytics_figures
+    seeded_app(size)
+    history = st.session_state.game_stats['play_history']
+    return lambda: build_analytics_figures(history)
+
+
+def import_main_seconds() -> float:
+    """``import main`` time on top of an imported streamlit, in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, '-c', IMPORT_PROBE], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+# name -> factory returning the function to time
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {
+    **{f"update_stats[ring={size}]": (lambda size=size: bench_update_stats(size)) for size in HISTORY_SIZES},
+    "check_ttt_winner": bench_check_ttt_winner,
+    "scramble_word[short]": lambda: bench_scramble_word("cat"),
+    "scramble_word[long]": lambda: bench_scramble_word("internationalization"),
+    "analytics_frame[10000]": lambda: bench_analytics_frame(10_000),
+    "analytics_figures[10000]": lambda: bench_analytics_figures(10_000),
+}
+
+
+def run(selected=None, repeat: int = 5) -> dict:
+    """Run the benchmarks (all, or those whose name contains one of ``selected``)"""
+    quiet_streamlit()
+    results = {}
+    for name, factory in BENCHMARKS.items():
+        if selected and not any(part in name for part in selected):
+            continue
+        seconds, number = measure(factory(), repeat=repeat)
+        results[name] = {'seconds': seconds, 'number': number}
+    if not selected or any(part in "import_main" for part in selected):
+        # Fresh interpreters, so measured directly rather than in a loop
+        results["import_main"] = {
+            'seconds': min(import_main_seconds() for _ in range(repeat)), 'number': 1
+        }
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> dict:
+    """Ratio of current to baseline time for every benchmark in both.
+
+    Returns ``{name: (ratio, regressed)}``; a benchmark regresses when it is
+    more than ``threshold`` (a fraction) slower than the baseline.
+    """
+    report = {}
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None or not base['seconds']:
+            continue
+        ratio = result['seconds'] / base['seconds']
+        report[name] = (ratio, ratio > 1 + threshold)
+    return report
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-k', dest='selected', action='append', help="only benchmarks whose name contains this")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', type=Path, help="write the results as a JSON baseline")
+    parser.add_argument('--compare', type=Path, help="compare against a JSON baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed fractional slowdown (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    results = run(args.selected, args.repeat)
+    baseline = json.loads(args.compare.read_text())['results'] if args.compare else {}
+    report = compare(results, baseline, args.threshold)
+
+    for name, result in results.items():
+        line = f"{name:28} {_format_seconds(result['seconds'])}"
+        if name in report:
+            ratio, regressed = report[name]
+            line += f"   {ratio:5.2f}x baseline" + ("   REGRESSION" if regressed else "")
+        print(line)
+
+    if args.save:
+        args.save.write_text(json.dumps({
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results,
+        }, indent=2) + "\n")
+    return 1 if any(regressed for _, regressed in report.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
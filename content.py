@@ -0,0 +1,74 @@
+"""
+Game Content
+============
+Quiz questions, loaded from ``data/quiz.json``.
+
+The file is read once per process and turned into immutable tables
+(tuples, frozen records and read-only mappings) indexed by category and
+difficulty. Every session shares the same objects, so a rerun does not
+rebuild any content, and content can grow by editing the data file rather
+than the code. Scramble words come from ``word_corpus``.
+"""
+
+import json
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Tuple
+
+DATA_DIR = Path(__file__).parent / "data"
+QUIZ_FILE = DATA_DIR / "quiz.json"
+
+
+class Question(NamedTuple):
+    category: str
+    difficulty: str
+    question: str
+    options: Tuple[str, ...]
+    answer: int             # index into options
+    explanation: str
+
+
+class QuizBank(NamedTuple):
+    questions: Tuple[Question, ...]
+    categories: Tuple[str, ...]
+    by_category: Mapping[str, Tuple[Question, ...]]
+    by_difficulty: Mapping[str, Tuple[Question, ...]]
+
+
+def _index(items, key) -> Mapping:
+    groups = defaultdict(list)
+    for item in items:
+        groups[key(item)].append(item)
+    return MappingProxyType({name: tuple(group) for name, group in groups.items()})
+
+
+@lru_cache(maxsize=None)
+def load_quiz_bank(path: Path = QUIZ_FILE) -> QuizBank:
+    """Load and index the question bank; cached for the life of the process"""
+    with open(path, encoding="utf-8") as f:
+        records = json.load(f)
+
+    questions = []
+    for record in records:
+        question = Question(
+            category=record["category"],
+            difficulty=record["difficulty"],
+            question=record["question"],
+            options=tuple(record["options"]),
+            answer=record["answer"],
+            explanation=record["explanation"],
+        )
+        if not 0 <= question.answer < len(question.options):
+            raise ValueError(f"answer index out of range for question: {question.question!r}")
+        questions.append(question)
+
+    by_category = _index(questions, lambda q: q.category)
+    return QuizBank(
+        questions=tuple(questions),
+        categories=tuple(by_category),
+        by_category=by_category,
+        by_difficulty=_index(questions, lambda q: q.difficulty),
+    )
+
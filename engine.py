@@ -0,0 +1,480 @@
+"""
+Headless Game Engines
+=====================
+The rules of every mini game as plain Python, with no Streamlit dependency.
+
+Each game has one state object and a step function that applies a single
+player action to it and returns what happened. The Streamlit views in
+``main.py`` keep the state objects in ``st.session_state``, render them and
+call the step functions; bots, simulations and load tests can drive the same
+functions directly at machine speed.
+
+Step functions mutate the state in place and take an optional ``rng``
+(anything with ``random.Random``'s interface) and ``now`` so runs can be
+made deterministic.
+"""
+
+import random
+import time
+from dataclasses import dataclass, field
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+
+# --------------------------------------------------------------------------
+# Number Guessing
+# --------------------------------------------------------------------------
+
+@dataclass(slots=True)
+class NumberGuessState:
+    """One round of the number guessing game"""
+    secret_number: int
+    low: int = 1
+    high: int = 100
+    max_attempts: int = 7
+    attempts: int = 0
+    game_over: bool = False
+    won: bool = False
+    # (attempt, guess, 'low' | 'high') for every wrong guess
+    hints: List[Tuple[int, int, str]] = field(default_factory=list)
+
+
+class GuessResult(NamedTuple):
+    outcome: str            # 'correct', 'low', 'high' or 'lost'
+    score: Optional[int]    # set once the game is over
+
+
+def new_number_guess(low=1, high=100, max_attempts=7, rng=random) -> NumberGuessState:
+    """Start a number guessing round with a random secret in ``[low, high]``"""
+    return NumberGuessState(rng.randint(low, high), low, high, max_attempts)
+
+
+def number_guess_score(attempts: int) -> int:
+    """Points for guessing the secret on the given attempt"""
+    return max(100 - (attempts - 1) * 10, 10)
+
+
+def number_guess_step(state: NumberGuessState, guess: int) -> GuessResult:
+    """Apply one guess"""
+    if state.game_over:
+        raise ValueError("the number guessing game is already over")
+    state.attempts += 1
+
+    if guess == state.secret_number:
+        state.won = True
+        state.game_over = True
+        return GuessResult('correct', number_guess_score(state.attempts))
+    if state.attempts >= state.max_attempts:
+        state.game_over = True
+        return GuessResult('lost', 0)
+
+    outcome = 'low' if guess < state.secret_number else 'high'
+    state.hints.append((state.attempts, guess, outcome))
+    return GuessResult(outcome, None)
+
+
+# --------------------------------------------------------------------------
+# Rock Paper Scissors
+# --------------------------------------------------------------------------
+
+RPS_CHOICES = ("rock", "paper", "scissors")
+RPS_INDEX = {choice: index for index, choice in enumerate(RPS_CHOICES)}
+RPS_SCORES = {"win": 10, "draw": 5, "lose": 0}
+
+# RPS_PAYOFF[player][computer] is the result from the player's side, with
+# moves as indices into RPS_CHOICES: each move beats the one before it.
+RPS_PAYOFF = tuple(
+    tuple(("draw", "win", "lose")[(player - computer) % 3] for computer in range(3))
+    for player in range(3)
+)
+
+
+@dataclass(slots=True)
+class RPSState:
+    """Running tally of a rock paper scissors session"""
+    player_wins: int = 0
+    computer_wins: int = 0
+    draws: int = 0
+    game_history: List[dict] = field(default_factory=list)
+
+
+class RPSResult(NamedTuple):
+    player: str
+    computer: str
+    result: str             # 'win', 'draw' or 'lose', from the player's side
+    score: int
+
+
+def determine_rps_winner(player_choice: str, computer_choice: str) -> str:
+    """Determine Rock Paper Scissors winner"""
+    return RPS_PAYOFF[RPS_INDEX[player_choice]][RPS_INDEX[computer_choice]]
+
+
+def rps_step(state: RPSState, player_choice: str, computer_choice: str = None, rng=random) -> RPSResult:
+    """Play one battle; the computer picks at random unless a choice is given"""
+    if computer_choice is None:
+        computer_choice = rng.choice(RPS_CHOICES)
+    result = determine_rps_winner(player_choice, computer_choice)
+
+    if result == "draw":
+        state.draws += 1
+    elif result == "win":
+        state.player_wins += 1
+    else:
+        state.computer_wins += 1
+
+    state.game_history.append({
+        'player': player_choice,
+        'computer': computer_choice,
+        'result': result
+    })
+    return RPSResult(player_choice, computer_choice, result, RPS_SCORES[result])
+
+
+# --------------------------------------------------------------------------
+# Word Scramble
+# --------------------------------------------------------------------------
+
+@dataclass(slots=True)
+class ScrambleState:
+    """A word scramble game of ``total_rounds`` rounds"""
+    difficulty: str
+    current_word: str = ''
+    scrambled_word: str = ''
+    score: int = 0
+    round: int = 1
+    total_rounds: int = 5
+    start_time: float = 0.0
+    game_active: bool = False
+
+
+class ScrambleResult(NamedTuple):
+    correct: bool
+    points: int
+    answer: str
+    finished: bool          # the last round was just played
+
+
+# Reshuffles tried before accepting a scramble that is a dictionary word
+SCRAMBLE_ATTEMPTS = 10
+
+
+def scramble_word(word: str, rng=random) -> str:
+    """Scramble the letters of a word.
+
+    The result always differs from ``word`` unless all its letters are the
+    same: if the shuffle happens to return the original order, two
+    different letters are swapped instead of shuffling again.
+    """
+    scrambled = list(word)
+    rng.shuffle(scrambled)
+    if ''.join(scrambled) == word and len(set(word)) > 1:
+        i = rng.randrange(len(word))
+        j = rng.choice([k for k, letter in enumerate(scrambled) if letter != scrambled[i]])
+        scrambled[i], scrambled[j] = scrambled[j], scrambled[i]
+    return ''.join(scrambled)
+
+
+def scramble_words(words: Sequence[str], seed=None) -> List[str]:
+    """Scramble many words at once, e.g. to pre-generate rounds of puzzles.
+
+    Same guarantee as ``scramble_word``, in a single vectorized pass: the
+    words are laid out as a padded letter matrix, every row is shuffled by
+    sorting random keys (padding always sorts last), and rows that come
+    out unchanged get two different letters swapped. ``seed`` is anything
+    ``numpy.random.default_rng`` accepts, including a ``Generator``.
+    """
+    import numpy as np
+
+    words = list(words)
+    if not words:
+        return []
+    rng = np.random.default_rng(seed)
+    n_words = len(words)
+    lengths = np.fromiter(map(len, words), dtype=np.intp, count=n_words)
+    width = max(int(lengths.max()), 1)
+    letters = np.array(words, dtype=f'U{width}').view('U1').reshape(n_words, width)
+    padding = np.arange(width) >= lengths[:, None]
+
+    keys = rng.random((n_words, width))
+    keys[padding] = 2.0
+    scrambled = np.take_along_axis(letters, np.argsort(keys, axis=1), axis=1)
+
+    # Rows that are unchanged but have at least two different letters
+    mixed = ((letters != letters[:, :1]) & ~padding).any(axis=1)
+    rows = np.flatnonzero((scrambled == letters).all(axis=1) & mixed)
+    if rows.size:
+        row_letters = scrambled[rows]
+        i = (rng.random(rows.size) * lengths[rows]).astype(np.intp)
+        differs = (row_letters != row_letters[np.arange(rows.size), i][:, None]) & ~padding[rows]
+        j = np.where(differs, rng.random(differs.shape), -1.0).argmax(axis=1)
+        scrambled[rows, i] = row_letters[np.arange(rows.size), j]
+        scrambled[rows, j] = row_letters[np.arange(rows.size), i]
+
+    return np.ascontiguousarray(scrambled).view(f'U{width}').ravel().tolist()
+
+
+def scramble_next_word(state: ScrambleState, words: Sequence[str], rng=random, now: float = None,
+                       corpus=None):
+    """Draw and scramble a new word for the current round.
+
+    With a ``corpus``, where any dictionary anagram is a valid answer, the
+    word is reshuffled (up to ``SCRAMBLE_ATTEMPTS`` times) until the puzzle
+    shown is not itself a dictionary word.
+    """
+    state.current_word = rng.choice(words)
+    state.scrambled_word = scramble_word(state.current_word, rng)
+    if corpus is not None:
+        for _ in range(SCRAMBLE_ATTEMPTS):
+            if state.scrambled_word not in corpus:
+                break
+            state.scrambled_word = scramble_word(state.current_word, rng)
+    state.start_time = time.time() if now is None else now
+
+
+def scramble_start(state: ScrambleState, words: Sequence[str], rng=random, now: float = None,
+                   corpus=None):
+    """Reset the score and begin round one"""
+    state.round = 1
+    state.score = 0
+    state.game_active = True
+    scramble_next_word(state, words, rng, now, corpus)
+
+
+def scramble_points(time_taken: float) -> int:
+    """Points for a correct answer given after ``time_taken`` seconds"""
+    return max(20 - int(time_taken), 5)
+
+
+def scramble_step(state: ScrambleState, guess: str, words: Sequence[str], rng=random, now: float = None,
+                  corpus=None) -> ScrambleResult:
+    """Check a guess and move on to the next round (or finish the game).
+
+    With a ``corpus`` (see ``word_corpus.WordCorpus``) any dictionary
+    anagram of the word is accepted, not just the word that was drawn,
+    except the scrambled word on screen: when every arrangement of the
+    letters is a word, typing the puzzle back must not score.
+    """
+    if not state.game_active:
+        raise ValueError("the word scramble game is not active")
+    now = time.time() if now is None else now
+
+    answer = state.current_word
+    if corpus is not None:
+        correct = (corpus.is_valid_answer(guess, answer)
+                   and guess.strip().lower() != state.scrambled_word.lower())
+    else:
+        correct = guess.strip().lower() == answer.lower()
+    points = scramble_points(now - state.start_time) if correct else 0
+    state.score += points
+
+    finished = state.round >= state.total_rounds
+    if finished:
+        state.game_active = False
+    else:
+        state.round += 1
+        scramble_next_word(state, words, rng, now, corpus)
+    return ScrambleResult(correct, points, answer, finished)
+
+
+# --------------------------------------------------------------------------
+# Quiz
+# --------------------------------------------------------------------------
+
+@dataclass(slots=True)
+class QuizState:
+    """Progress through one quiz"""
+    category: str
+    # The questions drawn for this quiz; anything with question, options,
+    # answer (index into options) and explanation attributes
+    questions: Tuple = ()
+    current_question: int = 0
+    score: int = 0
+    answers: List[dict] = field(default_factory=list)
+    quiz_active: bool = False
+    quiz_complete: bool = False
+
+
+class QuizResult(NamedTuple):
+    is_correct: bool
+    correct_answer: str
+    explanation: str
+    finished: bool          # the last question was just answered
+
+
+QUIZ_POINTS = 10
+QUIZ_LENGTH = 5
+
+
+def quiz_start(state: QuizState, category: str, questions: Sequence, length: int = QUIZ_LENGTH, rng=random):
+    """Begin a quiz of up to ``length`` questions drawn from ``questions``"""
+    if len(questions) > length:
+        questions = rng.sample(questions, length)
+    state.category = category
+    state.questions = tuple(questions)
+    state.current_question = 0
+    state.score = 0
+    state.answers = []
+    state.quiz_active = True
+    state.quiz_complete = False
+
+
+def quiz_step(state: QuizState, selected_index: int) -> QuizResult:
+    """Answer the current question with the option at ``selected_index``"""
+    if not state.quiz_active:
+        raise ValueError("the quiz is not active")
+    question = state.questions[state.current_question]
+    is_correct = selected_index == question.answer
+    correct_answer = question.options[question.answer]
+    if is_correct:
+        state.score += QUIZ_POINTS
+
+    state.answers.append({
+        'question': question.question,
+        'selected': question.options[selected_index],
+        'correct': correct_answer,
+        'is_correct': is_correct
+    })
+
+    finished = state.current_question >= len(state.questions) - 1
+    if finished:
+        state.quiz_complete = True
+        state.quiz_active = False
+    else:
+        state.current_question += 1
+    return QuizResult(is_correct, correct_answer, question.explanation, finished)
+
+
+# --------------------------------------------------------------------------
+# Tic-Tac-Toe
+# --------------------------------------------------------------------------
+
+TTT_WIN_SCORE = 10
+TTT_DRAW_SCORE = 5
+TTT_LOSS_SCORE = 0      # the computer opponent won
+
+
+# Cell ``i`` of the 3x3 board (row-major, 0-8) is bit ``1 << i``; each player
+# owns one 9-bit integer.
+TTT_FULL_BOARD = 0b111111111
+TTT_WIN_MASKS = tuple(
+    sum(1 << cell for cell in combo) for combo in (
+        (0, 1, 2), (3, 4, 5), (6, 7, 8),  # rows
+        (0, 3, 6), (1, 4, 7), (2, 5, 8),  # columns
+        (0, 4, 8), (2, 4, 6)              # diagonals
+    )
+)
+# TTT_WINNING[bits] is True when a player's bits contain a winning line
+TTT_WINNING = tuple(
+    any(bits & mask == mask for mask in TTT_WIN_MASKS) for bits in range(TTT_FULL_BOARD + 1)
+)
+
+
+def bitboard_from_board(board: Sequence[str]) -> Tuple[int, int]:
+    """Convert a 9-cell ``'X'``/``'O'``/``' '`` board to ``(x_bits, o_bits)``"""
+    x_bits = o_bits = 0
+    for cell, mark in enumerate(board):
+        if mark == 'X':
+            x_bits |= 1 << cell
+        elif mark == 'O':
+            o_bits |= 1 << cell
+    return x_bits, o_bits
+
+
+def board_from_bitboard(x_bits: int, o_bits: int) -> List[str]:
+    """Convert ``(x_bits, o_bits)`` back to a 9-cell list board"""
+    return ['X' if x_bits >> cell & 1 else 'O' if o_bits >> cell & 1 else ' ' for cell in range(9)]
+
+
+def bitboard_winner(x_bits: int, o_bits: int) -> Optional[str]:
+    """Return ``'X'`` or ``'O'`` if that player has three in a row"""
+    if TTT_WINNING[x_bits]:
+        return 'X'
+    if TTT_WINNING[o_bits]:
+        return 'O'
+    return None
+
+
+def legal_moves(x_bits: int, o_bits: int) -> int:
+    """Bitmask of the empty cells"""
+    return ~(x_bits | o_bits) & TTT_FULL_BOARD
+
+
+def iter_moves(moves: int):
+    """Yield the cell indices set in a move bitmask, lowest first"""
+    while moves:
+        low_bit = moves & -moves
+        yield low_bit.bit_length() - 1
+        moves ^= low_bit
+
+
+@dataclass(slots=True)
+class TicTacToeState:
+    """Bitboard and running tally of a tic-tac-toe session"""
+    x_bits: int = 0
+    o_bits: int = 0
+    current_player: str = 'X'
+    game_over: bool = False
+    winner: Optional[str] = None    # 'X', 'O' or 'Draw'
+    x_wins: int = 0
+    o_wins: int = 0
+    draws: int = 0
+    # Mark played by the computer opponent, None for two human players
+    computer_player: Optional[str] = None
+
+    @property
+    def board(self) -> List[str]:
+        """The board as a 9-cell ``'X'``/``'O'``/``' '`` list, for rendering"""
+        return board_from_bitboard(self.x_bits, self.o_bits)
+
+
+class TicTacToeResult(NamedTuple):
+    winner: Optional[str]   # 'X', 'O', 'Draw' or None while the game goes on
+    score: Optional[int]    # set once the game is over
+
+
+def check_ttt_winner(board: Sequence[str]) -> Optional[str]:
+    """Check for Tic-Tac-Toe winner"""
+    return bitboard_winner(*bitboard_from_board(board))
+
+
+def ttt_step(state: TicTacToeState, position: int) -> TicTacToeResult:
+    """Place the current player's mark on ``position`` (0-8)"""
+    if state.game_over:
+        raise ValueError("the tic-tac-toe game is already over")
+    cell = 1 << position
+    if not legal_moves(state.x_bits, state.o_bits) & cell:
+        raise ValueError(f"cell {position} is already taken")
+
+    if state.current_player == 'X':
+        state.x_bits |= cell
+        won = TTT_WINNING[state.x_bits]
+    else:
+        state.o_bits |= cell
+        won = TTT_WINNING[state.o_bits]
+
+    if won:
+        winner = state.current_player
+        state.winner = winner
+        state.game_over = True
+        if winner == 'X':
+            state.x_wins += 1
+        else:
+            state.o_wins += 1
+        score = TTT_LOSS_SCORE if winner == state.computer_player else TTT_WIN_SCORE
+        return TicTacToeResult(winner, score)
+    if state.x_bits | state.o_bits == TTT_FULL_BOARD:
+        state.game_over = True
+        state.winner = 'Draw'
+        state.draws += 1
+        return TicTacToeResult('Draw', TTT_DRAW_SCORE)
+
+    state.current_player = 'O' if state.current_player == 'X' else 'X'
+    return TicTacToeResult(None, None)
+
+
+def ttt_reset(state: TicTacToeState):
+    """Clear the board for a new game, keeping the tally"""
+    state.x_bits = state.o_bits = 0
+    state.current_player = 'X'
+    state.game_over = False
+    state.winner = None
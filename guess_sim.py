@@ -0,0 +1,128 @@
+"""
+Number Guessing Strategy Evaluator
+==================================
+Exhaustive, vectorized analysis of the number guessing game's range,
+attempt limit and scoring.
+
+A configuration is played against every possible secret at once (``trials``
+times over for randomized strategies). Each game keeps the interval that
+is still consistent with the hints it received, and every attempt is one
+set of NumPy operations over all unfinished games. ``evaluate_many``
+batches the games of many configurations together, so sweeping thousands
+of configurations costs about as many array passes as the largest attempt
+limit.
+
+Strategies are functions ``(lo, hi, rng) -> guesses`` over arrays of the
+current consistent bounds.
+"""
+
+from typing import Iterable, List, NamedTuple
+
+import numpy as np
+
+
+class GuessConfig(NamedTuple):
+    """Game setup; the defaults match ``engine.new_number_guess``/``number_guess_score``"""
+    low: int = 1
+    high: int = 100
+    max_attempts: int = 7
+    base_score: int = 100       # points for guessing on the first attempt
+    penalty: int = 10           # points lost per extra attempt
+    min_score: int = 10         # floor for any win
+
+
+class GuessReport(NamedTuple):
+    config: GuessConfig
+    expected_score: float           # mean points per game, losses included
+    loss_rate: float
+    mean_attempts: float            # mean attempts in the games that were won
+    attempt_distribution: np.ndarray    # [k] = share of games won on attempt k + 1
+
+
+def binary_search(lo, hi, rng):
+    """Always guess the middle of the remaining interval"""
+    return (lo + hi) // 2
+
+
+def uniform_random(lo, hi, rng):
+    """Any number still consistent with the hints, uniformly"""
+    return rng.integers(lo, hi + 1)
+
+
+def human_like(lo, hi, rng):
+    """Roughly the middle, with a spread, and a pull towards multiples of 5 in wide ranges"""
+    width = hi - lo
+    guesses = np.rint((lo + hi) / 2 + rng.normal(0.0, 0.2, lo.shape) * width).astype(np.int64)
+    rounded = np.rint(guesses / 5).astype(np.int64) * 5
+    guesses = np.where(width >= 20, rounded, guesses)
+    return np.clip(guesses, lo, hi)
+
+
+STRATEGIES = {
+    "binary": binary_search,
+    "random": uniform_random,
+    "human": human_like,
+}
+
+
+def evaluate_many(configs: Iterable[GuessConfig], strategy="binary", trials: int = 1, seed=None) -> List[GuessReport]:
+    """Play every secret of every configuration ``trials`` times with one strategy"""
+    configs = [GuessConfig(*config) for config in configs]
+    if not configs:
+        return []
+    strategy = STRATEGIES.get(strategy, strategy)
+    rng = np.random.default_rng(seed)
+
+    params = np.array(configs, dtype=np.int64)
+    low, high, max_attempts, base_score, penalty, min_score = params.T
+    sizes = (high - low + 1) * trials
+    owner = np.repeat(np.arange(len(configs)), sizes)
+    # Secrets low..high of each configuration, repeated `trials` times
+    offsets = np.arange(owner.size) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    secrets = low[owner] + offsets % (high - low + 1)[owner]
+
+    lo = low[owner]
+    hi = high[owner].copy()
+    game_limit = max_attempts[owner]
+    solved_at = np.zeros(owner.size, dtype=np.int64)
+    live = np.arange(owner.size)
+    for attempt in range(1, int(max_attempts.max()) + 1):
+        live = live[game_limit[live] >= attempt]
+        if not live.size:
+            break
+        guesses = strategy(lo[live], hi[live], rng)
+        target = secrets[live]
+        hit = guesses == target
+        solved_at[live[hit]] = attempt
+        too_low = guesses < target
+        lo[live[too_low]] = guesses[too_low] + 1
+        too_high = ~hit & ~too_low
+        hi[live[too_high]] = guesses[too_high] - 1
+        live = live[~hit]
+
+    won = solved_at > 0
+    scores = np.where(
+        won, np.maximum(base_score[owner] - (solved_at - 1) * penalty[owner], min_score[owner]), 0
+    )
+    n_configs = len(configs)
+    expected = np.bincount(owner, weights=scores, minlength=n_configs) / sizes
+    wins = np.bincount(owner, weights=won, minlength=n_configs)
+    attempts_sum = np.bincount(owner, weights=solved_at, minlength=n_configs)
+    width = int(max_attempts.max()) + 1
+    histogram = np.bincount(owner * width + solved_at, minlength=n_configs * width).reshape(n_configs, width)
+
+    return [
+        GuessReport(
+            config=config,
+            expected_score=float(expected[i]),
+            loss_rate=float(1 - wins[i] / sizes[i]),
+            mean_attempts=float(attempts_sum[i] / wins[i]) if wins[i] else 0.0,
+            attempt_distribution=histogram[i, 1:config.max_attempts + 1] / sizes[i],
+        )
+        for i, config in enumerate(configs)
+    ]
+
+
+def evaluate(config: GuessConfig = GuessConfig(), strategy="binary", trials: int = 1, seed=None) -> GuessReport:
+    """``evaluate_many`` for a single configuration"""
+    return evaluate_many([config], strategy, trials, seed)[0]
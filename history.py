@@ -0,0 +1,479 @@
+"""
+Columnar Play History
+=====================
+Compact, array-backed storage for the results recorded by ``update_stats``.
+
+Every finished game used to be kept as a dict with a formatted timestamp
+string. Here each field lives in its own typed NumPy column instead
+(int16 game code, int32 score, int64 timestamp: 14 bytes per record), and
+analytics can read the columns directly without converting row by row.
+
+The history can be bounded: once ``max_records`` raw records are held, the
+oldest record is folded into per-minute/hour/day rollups before its slot is
+reused. Totals, per-game counts and the cumulative score series stay exact;
+only the time resolution of old records is reduced. A bounded history
+mirrors its ring into arrays of twice the capacity so the retained records
+are always one contiguous view, so once full it takes 28 bytes per
+retained record. ``main.py`` bounds it by default (``DEFAULT_HISTORY_LIMIT``).
+
+Every append also updates small mergeable sketches that never evict: a
+per-game ``ScoreSketch`` for score quantiles and hourly play counts.
+"""
+
+import math
+import time
+from bisect import bisect_left
+from datetime import datetime, timezone
+
+import numpy as np
+
+MINUTE_MS = 60_000
+HOUR_MS = 60 * MINUTE_MS
+DAY_MS = 24 * HOUR_MS
+
+
+class ScoreSketch:
+    """Mergeable streaming histogram of scores (Ben-Haim & Tom-Tov style).
+
+    Holds at most ``max_bins`` ``(value, count)`` bins. While there are no
+    more distinct scores than that (the usual case: game scores are small
+    integers) quantiles are exact; beyond it the two closest bins are merged
+    into their weighted mean, so memory stays fixed and quantiles become
+    approximate.
+    """
+
+    __slots__ = ('max_bins', 'values', 'counts', 'count')
+
+    def __init__(self, max_bins: int = 64):
+        self.max_bins = max(int(max_bins), 2)
+        self.values = []
+        self.counts = []
+        self.count = 0
+
+    def add(self, value: float, count: int = 1):
+        index = bisect_left(self.values, value)
+        if index < len(self.values) and self.values[index] == value:
+            self.counts[index] += count
+        else:
+            self.values.insert(index, value)
+            self.counts.insert(index, count)
+            if len(self.values) > self.max_bins:
+                self._compress()
+        self.count += count
+
+    def merge(self, other: 'ScoreSketch'):
+        for value, count in zip(other.values, other.counts):
+            self.add(value, count)
+
+    def _compress(self):
+        while len(self.values) > self.max_bins:
+            values, counts = self.values, self.counts
+            i = min(range(len(values) - 1), key=lambda j: values[j + 1] - values[j])
+            total = counts[i] + counts[i + 1]
+            values[i] = (values[i] * counts[i] + values[i + 1] * counts[i + 1]) / total
+            counts[i] = total
+            del values[i + 1], counts[i + 1]
+
+    def quantile(self, q: float):
+        """Nearest-rank quantile (None while empty)"""
+        if not self.count:
+            return None
+        rank = max(math.ceil(q * self.count), 1)
+        seen = 0
+        for value, count in zip(self.values, self.counts):
+            seen += count
+            if seen >= rank:
+                return value
+        return self.values[-1]
+
+
+class RollupBucket:
+    """Count, score sum and per-game breakdown for one time bucket"""
+
+    __slots__ = ('count', 'total', 'last_ms', 'games')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.last_ms = 0
+        # game code -> [count, total]
+        self.games = {}
+
+    def add(self, code: int, score: int, timestamp_ms: int, count: int = 1):
+        """Add ``count`` records of ``code`` scoring ``score`` in total"""
+        self.count += count
+        self.total += score
+        self.last_ms = max(self.last_ms, timestamp_ms)
+        per_game = self.games.setdefault(code, [0, 0])
+        per_game[0] += count
+        per_game[1] += score
+
+    def merge(self, other: 'RollupBucket'):
+        self.count += other.count
+        self.total += other.total
+        self.last_ms = max(self.last_ms, other.last_ms)
+        for code, (count, total) in other.games.items():
+            per_game = self.games.setdefault(code, [0, 0])
+            per_game[0] += count
+            per_game[1] += total
+
+
+class Rollups:
+    """Per-minute, per-hour and per-day summaries of evicted records.
+
+    At most ``max_minutes`` minute buckets and ``max_hours`` hour buckets are
+    kept; the oldest ones are merged into the next coarser level. Day buckets
+    are kept indefinitely, which is one small bucket per day of play.
+    """
+
+    def __init__(self, max_minutes: int = 180, max_hours: int = 72):
+        self.max_minutes = max_minutes
+        self.max_hours = max_hours
+        # bucket start (epoch ms) -> RollupBucket, oldest first
+        self.minutes = {}
+        self.hours = {}
+        self.days = {}
+        self.count = 0
+        self.total = 0
+
+    def __len__(self):
+        return len(self.minutes) + len(self.hours) + len(self.days)
+
+    def add(self, code: int, score: int, timestamp_ms: int):
+        """Fold one raw record into its minute bucket"""
+        self.count += 1
+        self.total += score
+        self._minute(timestamp_ms).add(code, score, timestamp_ms)
+
+    def add_many(self, codes, scores, timestamps_ms):
+        """Fold many raw records at once, one bucket update per minute and game"""
+        codes = np.asarray(codes, dtype=np.int64)
+        scores = np.asarray(scores, dtype=np.int64)
+        timestamps_ms = np.asarray(timestamps_ms, dtype=np.int64)
+        if not len(codes):
+            return
+        minutes = timestamps_ms - timestamps_ms % MINUTE_MS
+        keys, first, inverse = np.unique(
+            np.stack([minutes, codes], axis=1), axis=0, return_index=True, return_inverse=True
+        )
+        inverse = inverse.ravel()
+        counts = np.bincount(inverse, minlength=len(keys))
+        totals = np.bincount(inverse, weights=scores, minlength=len(keys)).astype(np.int64)
+        last = np.full(len(keys), np.iinfo(np.int64).min)
+        np.maximum.at(last, inverse, timestamps_ms)
+        # Groups in order of first appearance, as add() would create the buckets
+        for group in np.argsort(first, kind='stable'):
+            self._minute(int(last[group])).add(
+                int(keys[group, 1]), int(totals[group]), int(last[group]), int(counts[group])
+            )
+        self.count += len(codes)
+        self.total += int(scores.sum())
+
+    def _minute(self, timestamp_ms: int) -> RollupBucket:
+        start = timestamp_ms - timestamp_ms % MINUTE_MS
+        bucket = self.minutes.get(start)
+        if bucket is None:
+            bucket = self.minutes[start] = RollupBucket()
+            if len(self.minutes) > self.max_minutes:
+                self._fold(self.minutes, self.hours, HOUR_MS)
+                if len(self.hours) > self.max_hours:
+                    self._fold(self.hours, self.days, DAY_MS)
+        return bucket
+
+    @staticmethod
+    def _fold(finer: dict, coarser: dict, width_ms: int):
+        start = next(iter(finer))
+        bucket = finer.pop(start)
+        coarse_start = start - start % width_ms
+        target = coarser.get(coarse_start)
+        if target is None:
+            coarser[coarse_start] = bucket
+        else:
+            target.merge(bucket)
+
+    def buckets(self):
+        """All buckets ordered by their last timestamp"""
+        buckets = [*self.days.values(), *self.hours.values(), *self.minutes.values()]
+        buckets.sort(key=lambda bucket: bucket.last_ms)
+        return buckets
+
+    def game_counts(self, n_games: int) -> np.ndarray:
+        """Number of evicted records per game code"""
+        counts = np.zeros(n_games, dtype=np.int64)
+        for bucket in self.buckets():
+            for code, (count, _) in bucket.games.items():
+                counts[code] += count
+        return counts
+
+
+class PlayHistory:
+    """Columnar log of finished games, optionally bounded.
+
+    Game names are dictionary-encoded into small integer codes, scores are
+    stored as int32 and timestamps as int64 epoch milliseconds (UTC).
+
+    Without ``max_records`` the columns grow by doubling. With it, they grow
+    up to ``max_records`` and then become a ring buffer whose two halves are
+    mirrored, so the retained records are always one contiguous slice and
+    ``columns()`` / ``to_frame()`` can return views instead of copies. Views
+    are only guaranteed to stay unchanged until the next ``append()``.
+    """
+
+    def __init__(self, capacity: int = 256, max_records: int = None, rollups: Rollups = None):
+        if max_records is not None:
+            max_records = max(int(max_records), 1)
+            capacity = min(capacity, max_records)
+        self.max_records = max_records
+        self.rollups = rollups if rollups is not None else Rollups()
+        # game code -> ScoreSketch, and hour start (epoch ms) -> plays
+        self.score_sketches = {}
+        self.hourly_counts = {}
+        self._names = []
+        self._codes = {}
+        self._size = 0
+        # Next write slot; in ring mode the retained records are the
+        # slice [head + capacity - size, head + capacity) of the buffers
+        self._head = 0
+        self._ring = False
+        self._allocate(max(int(capacity), 1))
+
+    def __len__(self):
+        """Number of raw records currently retained"""
+        return self._size
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield self[index]
+
+    def __getitem__(self, index):
+        """Return one retained record as a ``{'game', 'score', 'timestamp'}`` dict"""
+        if not isinstance(index, int):
+            raise TypeError("PlayHistory indices must be integers")
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("play history index out of range")
+        position = self._window()[0] + index
+        return {
+            'game': self._names[self._game[position]],
+            'score': int(self._score[position]),
+            'timestamp': datetime.fromtimestamp(int(self._timestamp[position]) / 1000, tz=timezone.utc),
+        }
+
+    @property
+    def total_records(self) -> int:
+        """Every record ever appended, including those rolled up"""
+        return self._size + self.rollups.count
+
+    @property
+    def game_names(self):
+        """Game names in code order (code ``i`` is ``game_names[i]``)"""
+        return tuple(self._names)
+
+    def encode_game(self, game_name: str) -> int:
+        """Return the integer code for a game name, assigning one if needed"""
+        code = self._codes.get(game_name)
+        if code is None:
+            code = len(self._names)
+            if code > np.iinfo(self._game.dtype).max:
+                raise ValueError("too many distinct game names for the history store")
+            self._codes[game_name] = code
+            self._names.append(game_name)
+        return code
+
+    def append(self, game_name: str, score: int, timestamp_ms: int = None):
+        """Record one finished game; the timestamp defaults to now"""
+        if timestamp_ms is None:
+            timestamp_ms = time.time_ns() // 1_000_000
+        code = self.encode_game(game_name)
+        self._sketch(code).add(score)
+        hour = timestamp_ms - timestamp_ms % HOUR_MS
+        self.hourly_counts[hour] = self.hourly_counts.get(hour, 0) + 1
+
+        if self._size == self._capacity:
+            if self._ring:
+                # Full ring: the slot at head holds the oldest record
+                head = self._head
+                self.rollups.add(int(self._game[head]), int(self._score[head]), int(self._timestamp[head]))
+                self._size -= 1
+            else:
+                new_capacity = self._capacity * 2
+                if self.max_records is not None:
+                    new_capacity = min(new_capacity, self.max_records)
+                self._grow(new_capacity)
+
+        head = self._head
+        self._game[head] = code
+        self._score[head] = score
+        self._timestamp[head] = timestamp_ms
+        if self._ring:
+            mirror = head + self._capacity
+            self._game[mirror] = code
+            self._score[mirror] = score
+            self._timestamp[mirror] = timestamp_ms
+            self._head = (head + 1) % self._capacity
+        else:
+            self._head = head + 1
+        self._size += 1
+
+    def extend(self, codes, scores, timestamps_ms):
+        """Record many finished games at once; the vectorized ``append()``.
+
+        ``codes`` must already be codes of this history (see
+        ``encode_game``). Records that do not fit a bounded history are
+        folded into the rollups in bulk, so memory stays bounded by
+        ``max_records`` however many records are passed over successive calls.
+        """
+        codes = np.asarray(codes, dtype=np.int16)
+        scores = np.asarray(scores, dtype=np.int32)
+        timestamps_ms = np.asarray(timestamps_ms, dtype=np.int64)
+        n = len(codes)
+        if not n:
+            return
+        for code in np.unique(codes):
+            values, counts = np.unique(scores[codes == code], return_counts=True)
+            sketch = self._sketch(int(code))
+            for value, count in zip(values.tolist(), counts.tolist()):
+                sketch.add(value, count)
+        hours, counts = np.unique(timestamps_ms - timestamps_ms % HOUR_MS, return_counts=True)
+        for hour, count in zip(hours.tolist(), counts.tolist()):
+            self.hourly_counts[hour] = self.hourly_counts.get(hour, 0) + count
+
+        size = self._size + n
+        if self.max_records is not None and (self._ring or size > self._capacity):
+            self._refill_ring(codes, scores, timestamps_ms)
+            return
+        if size > self._capacity:
+            capacity = self._capacity
+            while capacity < size:
+                capacity *= 2
+            self._grow(capacity)
+        head = self._head
+        self._game[head:head + n] = codes
+        self._score[head:head + n] = scores
+        self._timestamp[head:head + n] = timestamps_ms
+        self._head = head + n
+        self._size = size
+
+    def _refill_ring(self, codes, scores, timestamps_ms):
+        # Rebuild the ring from the retained and new records, rolling up
+        # whatever does not fit; same layout as _grow() into a ring
+        merged = [
+            np.concatenate([old, new])
+            for old, new in zip(self.columns(), (codes, scores, timestamps_ms))
+        ]
+        capacity = self.max_records
+        evicted = max(len(merged[0]) - capacity, 0)
+        self.rollups.add_many(*(column[:evicted] for column in merged))
+        size = len(merged[0]) - evicted
+        self._allocate(capacity)
+        for buffer, column in zip((self._game, self._score, self._timestamp), merged):
+            buffer[:size] = buffer[capacity:capacity + size] = column[evicted:]
+        self._head = size % capacity
+        self._size = size
+
+    def _sketch(self, code: int) -> ScoreSketch:
+        sketch = self.score_sketches.get(code)
+        if sketch is None:
+            sketch = self.score_sketches[code] = ScoreSketch()
+        return sketch
+
+    def _allocate(self, capacity: int):
+        self._capacity = capacity
+        # The ring starts once the buffers reach max_records; it needs
+        # twice the room for the mirrored half
+        self._ring = capacity == self.max_records
+        length = capacity * 2 if self._ring else capacity
+        self._game = np.empty(length, dtype=np.int16)
+        self._score = np.empty(length, dtype=np.int32)
+        self._timestamp = np.empty(length, dtype=np.int64)
+
+    def _grow(self, capacity: int):
+        # Reallocate instead of resizing in place: views handed out earlier
+        # keep pointing at the old buffers.
+        old = (self._game, self._score, self._timestamp)
+        size = self._size
+        self._allocate(capacity)
+        for new, column in zip((self._game, self._score, self._timestamp), old):
+            new[:size] = column[:size]
+            if self._ring:
+                new[capacity:capacity + size] = column[:size]
+        self._head = size % capacity if self._ring else size
+
+    def _window(self):
+        end = self._head + self._capacity if self._ring else self._head
+        return end - self._size, end
+
+    def columns(self):
+        """Return ``(game_codes, scores, timestamps_ms)`` of the retained records as read-only views"""
+        start, end = self._window()
+        views = (
+            self._game[start:end],
+            self._score[start:end],
+            self._timestamp[start:end],
+        )
+        for view in views:
+            view.flags.writeable = False
+        return views
+
+    def to_frame(self, last: int = None):
+        """Build a ``game``/``score``/``timestamp`` DataFrame over the retained records.
+
+        ``game`` is a categorical built straight from the stored codes and
+        ``timestamp`` is a ``datetime64[ms]`` view of the epoch column, so no
+        per-row conversion or string parsing happens. ``last`` limits the
+        frame to the newest records.
+        """
+        import pandas as pd
+
+        codes, scores, timestamps = self.columns()
+        if last is not None:
+            start = max(len(codes) - last, 0)
+            codes, scores, timestamps = codes[start:], scores[start:], timestamps[start:]
+        return pd.DataFrame({
+            'game': pd.Categorical.from_codes(codes, categories=self._names),
+            'score': scores,
+            'timestamp': timestamps.view('datetime64[ms]'),
+        }, copy=False)
+
+    def game_counts(self) -> np.ndarray:
+        """Exact number of records per game code, including rolled-up ones"""
+        codes = self.columns()[0]
+        counts = np.bincount(codes, minlength=len(self._names)).astype(np.int64)
+        if self.rollups.count:
+            counts += self.rollups.game_counts(len(self._names))
+        return counts
+
+    def score_quantiles(self, quantiles=(0.5, 0.95)):
+        """``{game name: (quantile, ...)}`` from the per-game score sketches"""
+        return {
+            self._names[code]: tuple(sketch.quantile(q) for q in quantiles)
+            for code, sketch in sorted(self.score_sketches.items())
+        }
+
+    def hourly_series(self):
+        """``(hour_starts_ms, plays)`` arrays in time order"""
+        hours = sorted(self.hourly_counts)
+        return (
+            np.array(hours, dtype=np.int64),
+            np.array([self.hourly_counts[hour] for hour in hours], dtype=np.int64),
+        )
+
+    def cumulative_series(self):
+        """Exact cumulative score over time as ``(timestamps_ms, cumulative)``.
+
+        Rolled-up records contribute one point per bucket, at the bucket's
+        last timestamp; retained records contribute one point each.
+        """
+        _, scores, timestamps = self.columns()
+        buckets = self.rollups.buckets()
+        if buckets:
+            timestamps = np.concatenate([
+                np.fromiter((bucket.last_ms for bucket in buckets), dtype=np.int64, count=len(buckets)),
+                timestamps
+            ])
+            scores = np.concatenate([
+                np.fromiter((bucket.total for bucket in buckets), dtype=np.int64, count=len(buckets)),
+                scores
+            ])
+        return timestamps, np.cumsum(scores, dtype=np.int64)
@@ -0,0 +1,199 @@
+"""
+History Export and Import
+=========================
+Streams a ``PlayHistory`` to and from Apache Arrow IPC files or Parquet,
+one record batch at a time.
+
+Files hold three columns: ``game`` (dictionary-encoded strings, written
+straight from the history's game codes), ``score`` (int32) and
+``timestamp`` (UTC milliseconds). Export slices the history's column views
+into batches, and import decodes each batch into code/score/timestamp
+arrays for ``PlayHistory.extend``, so neither direction builds per-record
+Python objects or holds more than one batch beyond the history itself.
+Importing into a bounded history keeps memory bounded however large the
+file is: older records are folded into the rollups as batches arrive.
+
+Only retained records can be exported; records already folded into
+rollups exist as aggregates only.
+
+pyarrow is imported on first use, so importing this module is cheap.
+"""
+
+import io
+from pathlib import Path
+
+import numpy as np
+
+from history import PlayHistory
+
+DEFAULT_CHUNK_SIZE = 65_536
+FORMATS = ("parquet", "arrow")
+PARQUET_MAGIC = b"PAR1"
+ARROW_MAGIC = b"ARROW1"
+MIME_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+
+
+def schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("game", pa.dictionary(pa.int16(), pa.string())),
+        ("score", pa.int32()),
+        ("timestamp", pa.timestamp("ms", tz="UTC")),
+    ])
+
+
+def iter_batches(history: PlayHistory, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Yield the retained records as Arrow record batches of ``chunk_size`` rows"""
+    import pyarrow as pa
+
+    file_schema = schema()
+    names = pa.array(history.game_names, type=pa.string())
+    codes, scores, timestamps = history.columns()
+    for start in range(0, len(codes), chunk_size):
+        stop = start + chunk_size
+        yield pa.RecordBatch.from_arrays([
+            pa.DictionaryArray.from_arrays(pa.array(codes[start:stop]), names),
+            pa.array(scores[start:stop]),
+            pa.array(timestamps[start:stop], type=file_schema.field("timestamp").type),
+        ], schema=file_schema)
+
+
+def export_history(history: PlayHistory, sink, format: str = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Write ``history`` to ``sink`` (a path or binary file) batch by batch.
+
+    ``format`` is ``"parquet"`` or ``"arrow"``; by default it follows the
+    file extension of a path sink and is Parquet otherwise. Each batch
+    becomes one Parquet row group or one Arrow record batch.
+    """
+    import pyarrow as pa
+
+    format = format or _format_for(sink)
+    if format not in FORMATS:
+        raise ValueError(f"unknown history format {format!r}; expected one of {FORMATS}")
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(sink, schema())
+    else:
+        writer = pa.ipc.new_file(sink, schema())
+    with writer:
+        for batch in iter_batches(history, chunk_size):
+            writer.write_batch(batch)
+
+
+def export_bytes(history: PlayHistory, format: str = "parquet", chunk_size: int = DEFAULT_CHUNK_SIZE) -> bytes:
+    """The exported file as bytes, e.g. for ``st.download_button``"""
+    buffer = io.BytesIO()
+    export_history(history, buffer, format, chunk_size)
+    return buffer.getvalue()
+
+
+def read_batches(source, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Yield the record batches of an exported file (a path or binary file).
+
+    The format is detected from the file's magic bytes. Parquet files are
+    read ``chunk_size`` rows at a time; Arrow files one stored batch at a
+    time, memory-mapped when ``source`` is a path. Raises ``ValueError``
+    for anything that is not a valid history file: an unknown format,
+    missing columns or null values.
+    """
+    for batch in _read_batches(source, chunk_size):
+        _validate(batch)
+        yield batch
+
+
+def _read_batches(source, chunk_size):
+    import pyarrow as pa
+
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as f:
+            magic = f.read(len(ARROW_MAGIC))
+    else:
+        magic = source.read(len(ARROW_MAGIC))
+        source.seek(0)
+
+    if magic.startswith(PARQUET_MAGIC):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(source)
+        _check_columns(parquet.schema_arrow)
+        yield from parquet.iter_batches(batch_size=chunk_size, columns=schema().names)
+    elif magic == ARROW_MAGIC:
+        if isinstance(source, (str, Path)):
+            source = pa.memory_map(str(source))
+        reader = pa.ipc.open_file(source)
+        _check_columns(reader.schema)
+        for index in range(reader.num_record_batches):
+            yield reader.get_batch(index)
+    else:
+        raise ValueError("not a Parquet or Arrow file")
+
+
+def _check_columns(file_schema):
+    import pyarrow as pa
+
+    missing = [name for name in schema().names if name not in file_schema.names]
+    if missing:
+        raise ValueError(f"missing column(s): {', '.join(missing)}")
+    game = file_schema.field("game").type
+    if pa.types.is_dictionary(game):
+        game = game.value_type
+    checks = (
+        ("game", pa.types.is_string(game) or pa.types.is_large_string(game)),
+        ("score", pa.types.is_integer(file_schema.field("score").type)),
+        ("timestamp", pa.types.is_timestamp(file_schema.field("timestamp").type)
+         or pa.types.is_integer(file_schema.field("timestamp").type)),
+    )
+    wrong = [name for name, ok in checks if not ok]
+    if wrong:
+        raise ValueError(f"unexpected type for column(s): {', '.join(wrong)}")
+
+
+def _validate(batch):
+    for name in schema().names:
+        column = batch.column(name)
+        if column.null_count:
+            raise ValueError(f"{column.null_count} null value(s) in column {name!r}")
+
+
+def _decode(batch, history: PlayHistory):
+    """``(codes, scores, timestamps_ms)`` arrays of ``history`` for one batch"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    games = batch.column("game")
+    if not pa.types.is_dictionary(games.type):
+        games = pc.dictionary_encode(games)
+    # Map the batch's dictionary onto the history's codes, then gather
+    mapping = np.array(
+        [history.encode_game(name) for name in games.dictionary.to_pylist()], dtype=np.int16
+    )
+    codes = mapping[games.indices.to_numpy(zero_copy_only=False)]
+
+    scores = batch.column("score").cast(pa.int32()).to_numpy(zero_copy_only=False)
+    timestamps = batch.column("timestamp")
+    if pa.types.is_timestamp(timestamps.type):
+        timestamps = timestamps.cast(pa.timestamp("ms", tz=timestamps.type.tz))
+    timestamps = timestamps.cast(pa.int64()).to_numpy(zero_copy_only=False)
+    return codes, scores, timestamps
+
+
+def import_history(source, history: PlayHistory = None, max_records: int = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> PlayHistory:
+    """Load an exported file into ``history`` (a new one by default), batch by batch"""
+    if history is None:
+        history = PlayHistory(max_records=max_records)
+    for batch in read_batches(source, chunk_size):
+        if batch.num_rows:
+            history.extend(*_decode(batch, history))
+    return history
+
+
+def _format_for(sink) -> str:
+    if isinstance(sink, (str, Path)) and Path(sink).suffix.lower() in (".arrow", ".feather", ".ipc"):
+        return "arrow"
+    return "parquet"
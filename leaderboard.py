@@ -0,0 +1,318 @@
+"""
+Shared Leaderboard
+==================
+Process-wide, per-game ranking of every player's total score, shared by
+all sessions (``main.py`` holds one instance via ``st.cache_resource``).
+
+Players are spread over lock stripes by a hash of their id. An update only
+takes its player's stripe lock, so concurrent sessions rarely wait on each
+other. Each stripe keeps, per game:
+
+* the players' current totals,
+* an order-statistic tree (a treap with subtree sizes) over those totals,
+  so "how many players are ahead of me" is O(log n),
+* a size-K min-heap of its best players.
+
+A rank query adds up the counts from every stripe (one short lock each);
+the global top K is a merge of the per-stripe heaps.
+
+Sessions without a stable player id come and go, so players expire after
+``idle_ttl`` seconds without a submission or rank query. Each stripe keeps
+its players in last-seen order and drops the idle ones whenever it is
+locked anyway, so memory follows the active players, not every session
+the process has served. A returning player's session passes all of its
+totals along with its next submission (``submit(..., restore=...)``), so
+the games they did not just play come back too.
+"""
+
+import heapq
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Optional, Tuple
+
+DEFAULT_STRIPES = 16
+DEFAULT_TOP_K = 10
+DEFAULT_IDLE_TTL = 60 * 60  # seconds
+
+
+class _Node:
+    __slots__ = ('key', 'count', 'size', 'priority', 'left', 'right')
+
+    def __init__(self, key, priority):
+        self.key = key
+        self.count = 1          # copies of key held by this node
+        self.size = 1           # copies in this subtree
+        self.priority = priority
+        self.left = None
+        self.right = None
+
+
+def _size(node) -> int:
+    return node.size if node is not None else 0
+
+
+def _update(node):
+    node.size = node.count + _size(node.left) + _size(node.right)
+
+
+def _rotate_right(node):
+    pivot = node.left
+    node.left, pivot.right = pivot.right, node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+
+def _rotate_left(node):
+    pivot = node.right
+    node.right, pivot.left = pivot.left, node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+
+class OrderStatisticTree:
+    """Multiset of numbers with O(log n) expected add, remove and rank queries"""
+
+    def __init__(self, rng=None):
+        self._root = None
+        self._random = (rng or random.Random()).random
+
+    def __len__(self):
+        return _size(self._root)
+
+    def add(self, key):
+        self._root = self._add(self._root, key)
+
+    def _add(self, node, key):
+        if node is None:
+            return _Node(key, self._random())
+        if key == node.key:
+            node.count += 1
+        elif key < node.key:
+            node.left = self._add(node.left, key)
+            if node.left.priority > node.priority:
+                return _rotate_right(node)
+        else:
+            node.right = self._add(node.right, key)
+            if node.right.priority > node.priority:
+                return _rotate_left(node)
+        _update(node)
+        return node
+
+    def remove(self, key):
+        """Remove one copy of ``key``; raises KeyError if there is none"""
+        self._root = self._remove(self._root, key)
+
+    def _remove(self, node, key):
+        if node is None:
+            raise KeyError(key)
+        if key < node.key:
+            node.left = self._remove(node.left, key)
+        elif key > node.key:
+            node.right = self._remove(node.right, key)
+        elif node.count > 1:
+            node.count -= 1
+        elif node.left is None:
+            return node.right
+        elif node.right is None:
+            return node.left
+        else:
+            # Rotate the higher-priority child up, then remove from below it
+            if node.left.priority > node.right.priority:
+                node = _rotate_right(node)
+                node.right = self._remove(node.right, key)
+            else:
+                node = _rotate_left(node)
+                node.left = self._remove(node.left, key)
+        _update(node)
+        return node
+
+    def count_above(self, key) -> int:
+        """Number of elements strictly greater than ``key``"""
+        node, count = self._root, 0
+        while node is not None:
+            if key < node.key:
+                count += node.count + _size(node.right)
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return count + _size(node.right)
+        return count
+
+
+class _Stripe:
+    __slots__ = ('lock', 'totals', 'trees', 'tops', 'last_seen')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # player -> last activity (monotonic seconds), least recent first
+        self.last_seen: "OrderedDict[str, float]" = OrderedDict()
+        # game -> {player: total}
+        self.totals: Dict[str, Dict[str, int]] = {}
+        # game -> OrderStatisticTree of the totals
+        self.trees: Dict[str, OrderStatisticTree] = {}
+        # game -> (min-heap of [total, player], {player: heap entry})
+        self.tops: Dict[str, Tuple[list, dict]] = {}
+
+
+class Leaderboard:
+    """Lock-striped per-game leaderboard of player totals.
+
+    Totals are expected to only grow (scores are never negative), which is
+    what lets each stripe keep its top K in a bounded heap. Players idle for
+    more than ``idle_ttl`` seconds are removed (``None`` keeps them forever).
+    """
+
+    def __init__(self, stripes: int = DEFAULT_STRIPES, top_k: int = DEFAULT_TOP_K,
+                 idle_ttl: Optional[float] = DEFAULT_IDLE_TTL, clock=time.monotonic):
+        self.top_k = top_k
+        self.idle_ttl = idle_ttl
+        self._clock = clock
+        self._stripes = tuple(_Stripe() for _ in range(max(int(stripes), 1)))
+
+    def _stripe(self, player: str) -> _Stripe:
+        return self._stripes[hash(player) % len(self._stripes)]
+
+    def _touch(self, stripe: _Stripe, player: str, now: float):
+        stripe.last_seen[player] = now
+        stripe.last_seen.move_to_end(player)
+
+    def _expire(self, stripe: _Stripe, now: float):
+        # Caller holds stripe.lock
+        if self.idle_ttl is None:
+            return
+        last_seen = stripe.last_seen
+        while last_seen:
+            player, seen = next(iter(last_seen.items()))
+            if now - seen <= self.idle_ttl:
+                break
+            self._remove(stripe, player)
+
+    def _remove(self, stripe: _Stripe, player: str):
+        # Caller holds stripe.lock
+        stripe.last_seen.pop(player, None)
+        for game, totals in stripe.totals.items():
+            total = totals.pop(player, None)
+            if total is None:
+                continue
+            stripe.trees[game].remove(total)
+            heap, entries = stripe.tops[game]
+            if entries.pop(player, None) is not None:
+                # Refill from the stripe's remaining totals
+                best = heapq.nlargest(self.top_k, ((t, p) for p, t in totals.items()))
+                entries.clear()
+                heap[:] = [[t, p] for t, p in best]
+                heapq.heapify(heap)
+                entries.update((entry[1], entry) for entry in heap)
+
+    def remove(self, player: str):
+        """Drop every total of ``player``"""
+        stripe = self._stripe(player)
+        with stripe.lock:
+            self._remove(stripe, player)
+
+    def submit(self, player: str, game: str, total: int, restore: Mapping[str, int] = None):
+        """Set ``player``'s total score for ``game``.
+
+        ``restore`` holds all of the player's game totals; they are put
+        back first if the player is not on the board (new, or expired while
+        idle), so one game's submission does not leave their others missing.
+        """
+        stripe = self._stripe(player)
+        now = self._clock()
+        with stripe.lock:
+            self._expire(stripe, now)
+            if restore and player not in stripe.last_seen:
+                for other, other_total in restore.items():
+                    self._set(stripe, player, other, other_total)
+            self._touch(stripe, player, now)
+            self._set(stripe, player, game, total)
+
+    def submit_all(self, player: str, totals: Mapping[str, int]):
+        """Set ``player``'s totals for several games at once"""
+        stripe = self._stripe(player)
+        now = self._clock()
+        with stripe.lock:
+            self._expire(stripe, now)
+            self._touch(stripe, player, now)
+            for game, total in totals.items():
+                self._set(stripe, player, game, total)
+
+    def _set(self, stripe: _Stripe, player: str, game: str, total: int):
+        # Caller holds stripe.lock
+        totals = stripe.totals.setdefault(game, {})
+        old = totals.get(player)
+        if old == total:
+            return
+        tree = stripe.trees.get(game)
+        if tree is None:
+            tree = stripe.trees[game] = OrderStatisticTree()
+        if old is not None:
+            tree.remove(old)
+        tree.add(total)
+        totals[player] = total
+
+        heap, entries = stripe.tops.setdefault(game, ([], {}))
+        entry = entries.get(player)
+        if entry is not None:
+            entry[0] = total
+            heapq.heapify(heap)
+        elif len(heap) < self.top_k:
+            entries[player] = entry = [total, player]
+            heapq.heappush(heap, entry)
+        elif total > heap[0][0]:
+            entries[player] = entry = [total, player]
+            evicted = heapq.heapreplace(heap, entry)
+            del entries[evicted[1]]
+
+    def total(self, player: str, game: str) -> Optional[int]:
+        stripe = self._stripe(player)
+        with stripe.lock:
+            return stripe.totals.get(game, {}).get(player)
+
+    def rank(self, player: str, game: str) -> Optional[Tuple[int, int]]:
+        """``(position, players)`` for ``game`` (1 is best; ties share a position).
+
+        Counts as activity for ``player``.
+        """
+        own = self._stripe(player)
+        now = self._clock()
+        with own.lock:
+            total = own.totals.get(game, {}).get(player)
+            if total is not None:
+                self._touch(own, player, now)
+        if total is None:
+            return None
+        ahead = players = 0
+        for stripe in self._stripes:
+            with stripe.lock:
+                self._expire(stripe, now)
+                tree = stripe.trees.get(game)
+                if tree is not None:
+                    ahead += tree.count_above(total)
+                    players += len(tree)
+        return ahead + 1, players
+
+    def top_percent(self, player: str, game: str) -> Optional[float]:
+        """The X in "top X%" for ``game``, or None if the player has no total"""
+        rank = self.rank(player, game)
+        if rank is None:
+            return None
+        position, players = rank
+        return 100.0 * position / players
+
+    def top(self, game: str, k: int = None) -> List[Tuple[str, int]]:
+        """Best ``k`` (at most ``top_k``) ``(player, total)`` pairs for ``game``"""
+        entries = []
+        now = self._clock()
+        for stripe in self._stripes:
+            with stripe.lock:
+                self._expire(stripe, now)
+                heap, _ = stripe.tops.get(game, ([], {}))
+                entries.extend((total, player) for total, player in heap)
+        best = heapq.nlargest(min(k or self.top_k, self.top_k), entries)
+        return [(player, total) for total, player in best]
@@ -7,216 +7,126 @@ Project: collab-coding-group-[ID]
 Theme: Mini Games Collection with Streamlit GUI
 """
 
+import hmac
+import os
 import streamlit as st
-import random
-import time
+import uuid
+from streamlit.errors import StreamlitAPIException
 from typing import List, Dict, Union
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
 
+import assets
+import content
+import engine
+import history_io
+import metrics
+import rps_ai
+import ttt_ai
+import word_corpus
+from analytics import cached_analytics_figures, cached_file_figures, cached_store_figures
+from history import PlayHistory
+from leaderboard import Leaderboard
+from storage import SQLiteStatsStore
 
-# Page configuration with custom styling
-st.set_page_config(
-    page_title="🎮 Mini Games Collection",
-    page_icon="🎮",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# Set to a file path to persist stats in SQLite across refreshes and restarts
+DB_PATH_ENV = "MINIGAMES_DB_PATH"
+# Raw records kept per session; older ones are folded into time rollups
+HISTORY_LIMIT_ENV = "MINIGAMES_HISTORY_LIMIT"
+DEFAULT_HISTORY_LIMIT = 5000
+# Set to a secret to show the metrics page to visitors of ?admin=<secret>
+ADMIN_TOKEN_ENV = "MINIGAMES_ADMIN_TOKEN"
+
+
+# Hint text for wrong guesses in the number guessing game
+NUMBER_HINTS = {
+    'low': "📈 Too low! Try a higher number.",
+    'high': "📉 Too high! Try a lower number."
+}
+
+
+# Rock paper scissors battles recorded before the header cards are refreshed
+RPS_HEADER_REFRESH = 5
+
+
+# Word scramble difficulty labels and their word_corpus difficulty level
+SCRAMBLE_DIFFICULTIES = {
+    "Easy 🟢": "easy",
+    "Medium 🟡": "medium",
+    "Hard 🔴": "hard"
+}
+SCRAMBLE_LEVELS = tuple(SCRAMBLE_DIFFICULTIES)
+
+
+# Sidebar page -> game name recorded by update_stats
+GAME_NAMES = {
+    "number_guessing": "Number Guessing",
+    "rock_paper_scissors": "Rock Paper Scissors",
+    "word_scramble": "Word Scramble",
+    "quiz": "Quiz Game",
+    "tic_tac_toe": "Tic-Tac-Toe"
+}
+
+
+def configure_page():
+    """Apply page configuration and the custom theme.
+
+    Called at the start of ``run()`` rather than at import, so importing
+    this module (tests, workers) has no Streamlit side effects.
+    """
+    # Page configuration with custom styling
+    st.set_page_config(
+        page_title="🎮 Mini Games Collection",
+        page_icon="🎮",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    assets.inject_theme()
+
+
+@st.cache_resource
+def get_stats_store():
+    """Process-wide SQLite store, or None when persistence is not configured"""
+    path = os.environ.get(DB_PATH_ENV)
+    return SQLiteStatsStore(path) if path else None
+
+
+@st.cache_resource
+def get_leaderboard():
+    """Leaderboard shared by every session in the process"""
+    return Leaderboard()
+
+
+def get_player_id():
+    """Stable player id kept in the URL, so it survives a browser refresh"""
+    player = st.query_params.get('player')
+    if not player:
+        player = uuid.uuid4().hex
+        st.query_params['player'] = player
+    return player
+
+
+def history_limit() -> int:
+    return int(os.environ.get(HISTORY_LIMIT_ENV, DEFAULT_HISTORY_LIMIT))
+
+
+def is_admin():
+    """True when the URL carries the configured admin token"""
+    token = os.environ.get(ADMIN_TOKEN_ENV)
+    # Bytes: compare_digest rejects str arguments with non-ASCII characters
+    return bool(token) and hmac.compare_digest(
+        st.query_params.get('admin', '').encode('utf-8'), token.encode('utf-8')
+    )
 
-# Enhanced Custom CSS for beautiful styling
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;600;700&display=swap');
-    
-    /* Main header styling */
-    .main-header {
-        font-family: 'Poppins', sans-serif;
-        font-size: 2.5rem;
-        font-weight: 700;
-        text-align: center;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin-bottom: 1.5rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    /* Enhanced sidebar styling */
-    .css-1d391kg {
-        background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
-        padding-top: 2rem;
-    }
-    
-    .sidebar-content {
-        background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
-        border-radius: 15px;
-        padding: 1rem;
-        margin: 1rem 0;
-    }
-    
-    .sidebar-title {
-        color: white;
-        font-family: 'Poppins', sans-serif;
-        font-size: 1.5rem;
-        font-weight: 600;
-        text-align: center;
-        margin-bottom: 1rem;
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.3);
-    }
-    
-    .sidebar .sidebar-content .block-container {
-        padding: 1rem;
-        background: rgba(255,255,255,0.1);
-        border-radius: 10px;
-        backdrop-filter: blur(10px);
-    }
-    
-    /* Enhanced stats cards - consistent sizing */
-    .stats-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 1.5rem;
-        border-radius: 15px;
-        color: white;
-        text-align: center;
-        box-shadow: 0 8px 25px rgba(0,0,0,0.15);
-        height: 120px;
-        display: flex;
-        flex-direction: column;
-        justify-content: center;
-        transition: transform 0.3s ease;
-        margin-bottom: 1rem;
-    }
-    
-    .stats-card:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 12px 35px rgba(0,0,0,0.2);
-    }
-    
-    .stats-card h3 {
-        margin: 0;
-        font-size: 0.9rem;
-        font-weight: 400;
-        opacity: 0.9;
-    }
-    
-    .stats-card h2 {
-        margin: 0.5rem 0 0 0;
-        font-size: 1.8rem;
-        font-weight: 700;
-    }
-    
-    /* Game card styling */
-    .game-card {
-        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        padding: 2rem;
-        border-radius: 20px;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-        margin: 1rem 0;
-        transition: transform 0.3s ease;
-    }
-    
-    .game-card:hover {
-        transform: translateY(-5px);
-    }
-    
-    /* Winner animation */
-    .winner-animation {
-        animation: pulse 2s infinite;
-        color: #ff6b6b;
-        font-size: 1.8rem;
-        text-align: center;
-        padding: 1rem;
-        background: linear-gradient(135deg, #ffeaa7, #fab1a0);
-        border-radius: 15px;
-        margin: 1rem 0;
-    }
-    
-    @keyframes pulse {
-        0% { transform: scale(1); }
-        50% { transform: scale(1.05); }
-        100% { transform: scale(1); }
-    }
-    
-    /* Enhanced button styling */
-    .stButton > button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        border-radius: 25px;
-        padding: 0.5rem 2rem;
-        font-weight: 600;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-        width: 100%;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(0,0,0,0.3);
-    }
-    
-    /* Radio button styling for sidebar */
-    .stRadio > div {
-        background: rgba(255,255,255,0.1);
-        border-radius: 10px;
-        padding: 0.5rem;
-        margin: 0.2rem 0;
-    }
-    
-    .stRadio > div > label {
-        color: white;
-        font-weight: 500;
-        padding: 0.5rem;
-        border-radius: 8px;
-        transition: background 0.3s ease;
-    }
-    
-    .stRadio > div > label:hover {
-        background: rgba(255,255,255,0.2);
-    }
-    
-    /* Welcome section styling */
-    .welcome-section {
-        background: linear-gradient(135deg, #a8edea 0%, #fed6e3 100%);
-        padding: 2rem;
-        border-radius: 20px;
-        margin: 2rem 0;
-        text-align: center;
-    }
-    
-    .game-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-        gap: 1rem;
-        margin: 2rem 0;
-    }
-    
-    .game-item {
-        background: linear-gradient(135deg, #74b9ff, #0984e3);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 15px;
-        text-align: center;
-        transition: transform 0.3s ease;
-    }
-    
-    .game-item:hover {
-        transform: translateY(-5px);
-    }
-    
-    /* Footer styling */
-    .footer {
-        text-align: center;
-        color: #666;
-        padding: 2rem;
-        background: linear-gradient(135deg, #f8f9fa, #e9ecef);
-        border-radius: 15px;
-        margin-top: 3rem;
-    }
-</style>
-""", unsafe_allow_html=True)
+
+def rerun_fragment():
+    """Rerun only the calling fragment.
+
+    Falls back to a full rerun when the fragment is running as part of a
+    full script run, where Streamlit does not allow a fragment-scoped rerun.
+    """
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
 
 
 class StreamlitMiniGames:
@@ -228,18 +138,76 @@ class StreamlitMiniGames:
                 'games_played': 0,
                 'total_score': 0,
                 'favorite_game': 'None',
-                'play_history': []
+                'play_history': PlayHistory(max_records=history_limit()),
+                # Per-game counters, keyed in first-played order
+                'game_counts': {},
+                'game_score_sums': {},
+                'game_min_scores': {},
+                'game_max_scores': {},
+                # Running min/max over every game, None until the first result
+                'min_score': None,
+                'max_score': None,
+                # Bumped on every recorded game; keys the analytics cache
+                'version': 0,
+                'session_id': uuid.uuid4().hex,
+                'player_id': None
             }
+            store = get_stats_store()
+            if store is not None:
+                self.load_persisted_stats(store, get_player_id())
+    
+    def load_persisted_stats(self, store, player_id):
+        """Seed the running totals from the persistent store"""
+        stats = st.session_state.game_stats
+        stats['player_id'] = player_id
+        totals = store.game_totals(player_id)
+        if not totals:
+            return
+        stats['game_counts'] = {game: t.plays for game, t in totals.items()}
+        stats['game_score_sums'] = {game: t.total_score for game, t in totals.items()}
+        stats['game_min_scores'] = {game: t.min_score for game, t in totals.items()}
+        stats['game_max_scores'] = {game: t.max_score for game, t in totals.items()}
+        stats['games_played'] = sum(stats['game_counts'].values())
+        stats['total_score'] = sum(stats['game_score_sums'].values())
+        stats['min_score'] = min(stats['game_min_scores'].values())
+        stats['max_score'] = max(stats['game_max_scores'].values())
+        get_leaderboard().submit_all(player_id, stats['game_score_sums'])
+        stats['favorite_game'] = store.favorite_game(player_id)
     
-    def display_header(self):
-        """Display beautiful animated header with consistent stats cards"""
+    @metrics.timed("header_seconds")
+    def display_header(self, game_name=None):
+        """Display beautiful animated header with consistent stats cards.
+
+        ``game_name`` picks the game for the leaderboard standing; it
+        defaults to the favorite game.
+        """
         st.markdown('<h1 class="main-header">🎮 Mini Games Collection</h1>', unsafe_allow_html=True)
         st.markdown("---")
         
-        # Calculate average score
-        avg_score = 0
-        if st.session_state.game_stats['play_history']:
-            avg_score = sum(game['score'] for game in st.session_state.game_stats['play_history']) / len(st.session_state.game_stats['play_history'])
+        stats = st.session_state.game_stats
+        # Fragments compare against this to tell how stale the cards are
+        st.session_state.header_version = stats['version']
+        
+        # Everything below comes from running totals kept by update_stats
+        avg_score = self.average_score()
+        favorite = stats['favorite_game']
+        favorite_detail = ""
+        if favorite in stats['game_counts']:
+            favorite_detail = f"{stats['game_counts'][favorite]} plays · avg {self.average_score(favorite):.1f}"
+        score_range = ""
+        if stats['min_score'] is not None:
+            score_range = f"best {stats['max_score']} · lowest {stats['min_score']}"
+        standing = ""
+        ranked_game = game_name or favorite
+        leaderboard = get_leaderboard()
+        player = stats['player_id'] or stats['session_id']
+        top_percent = leaderboard.top_percent(player, ranked_game)
+        if top_percent is None and ranked_game in stats['game_score_sums']:
+            # Expired while idle; this session still has the totals
+            leaderboard.submit_all(player, stats['game_score_sums'])
+            top_percent = leaderboard.top_percent(player, ranked_game)
+        if top_percent is not None:
+            standing = f"top {max(top_percent, 1):.0f}% in {ranked_game}"
         
         # Enhanced stats display with consistent card sizing
         col1, col2, col3, col4 = st.columns(4)
@@ -248,7 +216,7 @@ class StreamlitMiniGames:
             st.markdown(f"""
             <div class="stats-card">
                 <h3>🎯 Games Played</h3>
-                <h2>{st.session_state.game_stats['games_played']}</h2>
+                <h2>{stats['games_played']}</h2>
             </div>
             """, unsafe_allow_html=True)
         
@@ -256,7 +224,8 @@ class StreamlitMiniGames:
             st.markdown(f"""
             <div class="stats-card">
                 <h3>⭐ Total Score</h3>
-                <h2>{st.session_state.game_stats['total_score']}</h2>
+                <h2>{stats['total_score']}</h2>
+                <small>{standing}</small>
             </div>
             """, unsafe_allow_html=True)
         
@@ -264,7 +233,8 @@ class StreamlitMiniGames:
             st.markdown(f"""
             <div class="stats-card">
                 <h3>❤️ Favorite Game</h3>
-                <h2 style="font-size: 1.2rem;">{st.session_state.game_stats['favorite_game']}</h2>
+                <h2 style="font-size: 1.2rem;">{favorite}</h2>
+                <small>{favorite_detail}</small>
             </div>
             """, unsafe_allow_html=True)
         
@@ -273,6 +243,7 @@ class StreamlitMiniGames:
             <div class="stats-card">
                 <h3>📊 Average Score</h3>
                 <h2>{avg_score:.1f}</h2>
+                <small>{score_range}</small>
             </div>
             """, unsafe_allow_html=True)
     
@@ -296,6 +267,8 @@ class StreamlitMiniGames:
             "❌⭕ Tic-Tac-Toe": "tic_tac_toe",
             "📊 Analytics": "analytics"
         }
+        if is_admin():
+            games["📈 Metrics"] = "metrics"
         
         selected_game = st.sidebar.radio(
             "",
@@ -320,6 +293,8 @@ class StreamlitMiniGames:
    
   #number guessing 
  
+    @st.fragment
+    @metrics.timed("page_seconds", page="number_guessing")
     def number_guessing_game(self):
         """
         Beautiful Number Guessing Game with Streamlit
@@ -330,75 +305,67 @@ class StreamlitMiniGames:
         
         # Initialize game state
         if 'number_game' not in st.session_state:
-            st.session_state.number_game = {
-                'secret_number': random.randint(1, 100),
-                'attempts': 0,
-                'max_attempts': 7,
-                'game_over': False,
-                'won': False,
-                'hints': []
-            }
+            st.session_state.number_game = engine.new_number_guess()
         
         game = st.session_state.number_game
         
-        if not game['game_over']:
+        if not game.game_over:
             col1, col2 = st.columns([3, 1])
             
             with col1:
                 guess = st.number_input(
-                    f"Attempt {game['attempts'] + 1}/{game['max_attempts']} - Enter your guess:",
-                    min_value=1,
-                    max_value=100,
+                    f"Attempt {game.attempts + 1}/{game.max_attempts} - Enter your guess:",
+                    min_value=game.low,
+                    max_value=game.high,
                     value=50,
-                    key=f"guess_input_{game['attempts']}"
+                    key=f"guess_input_{game.attempts}"
                 )
             
             with col2:
                 if st.button("🎯 Submit Guess", key="submit_guess"):
-                    game['attempts'] += 1
+                    result = engine.number_guess_step(game, guess)
                     
-                    if guess == game['secret_number']:
-                        game['won'] = True
-                        game['game_over'] = True
-                        score = max(100 - (game['attempts'] - 1) * 10, 10)
-                        self.update_stats('Number Guessing', score)
-                        
-                        st.markdown(f'<div class="winner-animation">🎉 Congratulations! You guessed it in {game["attempts"]} attempts!</div>', unsafe_allow_html=True)
-                        st.balloons()
+                    if result.outcome == 'correct':
+                        self.update_stats('Number Guessing', result.score)
+                        st.session_state.number_feedback = [
+                            ('winner', f"🎉 Congratulations! You guessed it in {game.attempts} attempts!"),
+                            ('balloons', None)
+                        ]
+                        # Full rerun so the header cards include this game
+                        st.rerun()
                         
-                    elif game['attempts'] >= game['max_attempts']:
-                        game['game_over'] = True
-                        st.error(f"😔 Game Over! The number was {game['secret_number']}")
+                    elif result.outcome == 'lost':
                         self.update_stats('Number Guessing', 0)
+                        st.session_state.number_feedback = [
+                            ('error', f"😔 Game Over! The number was {game.secret_number}")
+                        ]
+                        st.rerun()
                         
                     else:
-                        if guess < game['secret_number']:
-                            hint = f"📈 Too low! Try a higher number."
-                            st.info(hint)
-                        else:
-                            hint = f"📉 Too high! Try a lower number."
-                            st.info(hint)
-                        
-                        game['hints'].append(f"Attempt {game['attempts']}: {guess} - {hint}")
+                        st.info(NUMBER_HINTS[result.outcome])
             
             # Display hints history
-            if game['hints']:
+            if game.hints:
                 st.markdown("### 💡 Previous Hints:")
-                for hint in game['hints'][-3:]:  # Show last 3 hints
-                    st.text(hint)
+                for attempt, previous_guess, outcome in game.hints[-3:]:  # Show last 3 hints
+                    st.text(f"Attempt {attempt}: {previous_guess} - {NUMBER_HINTS[outcome]}")
             
             # Progress bar
-            progress = game['attempts'] / game['max_attempts']
+            progress = game.attempts / game.max_attempts
             st.progress(progress)
             
         else:
+            # Result of the final guess, shown once after the full rerun
+            self.show_feedback(st.session_state.pop('number_feedback', []))
             if st.button("🔄 Play Again"):
                 del st.session_state.number_game
-                st.rerun()
+                rerun_fragment()
 
 
   # rock_paper_scissors
-def rock_paper_scissors(self):
+    @st.fragment
+    @metrics.timed("page_seconds", page="rock_paper_scissors")
+    def rock_paper_scissors(self):
         """
         Beautiful Rock Paper Scissors with Streamlit
         Author: Rishabh
@@ -408,25 +375,18 @@ def rock_paper_scissors(self):
         
         # Initialize game state
         if 'rps_game' not in st.session_state:
-            st.session_state.rps_game = {
-                'player_wins': 0,
-                'computer_wins': 0,
-                'draws': 0,
-                'game_history': []
-            }
+            st.session_state.rps_game = engine.RPSState()
+            st.session_state.rps_model = rps_ai.RPSModel()
         
         game = st.session_state.rps_game
+        model = st.session_state.rps_model
         choices = ["🪨 Rock", "📄 Paper", "✂️ Scissors"]
         choice_map = {"🪨 Rock": "rock", "📄 Paper": "paper", "✂️ Scissors": "scissors"}
         
-        # Score display
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("🎮 Your Wins", game['player_wins'])
-        with col2:
-            st.metric("🤖 Computer Wins", game['computer_wins'])
-        with col3:
-            st.metric("🤝 Draws", game['draws'])
+        # Score display, filled in below once this click's battle is counted
+        scoreboard = st.container()
+        
+        opponent = st.radio("Opponent:", rps_ai.OPPONENTS, horizontal=True, key="rps_opponent")
         
         # Game interface
         st.markdown("### Make Your Choice:")
@@ -435,32 +395,41 @@ def rock_paper_scissors(self):
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
             if st.button("⚔️ BATTLE!", key="rps_battle", use_container_width=True):
-                player_choice = choice_map[selected_choice]
-                computer_choice = random.choice(["rock", "paper", "scissors"])
-                
-                # Determine winner
-                result = self.determine_rps_winner(player_choice, computer_choice)
+                battle = rps_ai.play_round(game, model, choice_map[selected_choice],
+                                            adaptive=opponent == "🧠 Adaptive")
+                stats = st.session_state.game_stats
+                favorite = stats['favorite_game']
+                self.update_stats('Rock Paper Scissors', battle.score)
                 
-                if result == "draw":
-                    game['draws'] += 1
+                # Battles are too frequent to rerun the whole app for each,
+                # so the header cards are refreshed every few battles, or
+                # straight away when the favorite game changes; the result
+                # is then shown once after that rerun
+                behind = stats['version'] - st.session_state.get('header_version', 0)
+                if behind >= RPS_HEADER_REFRESH or stats['favorite_game'] != favorite:
+                    st.session_state.rps_last_battle = (selected_choice, battle)
+                    st.rerun()
+            else:
+                last_battle = st.session_state.pop('rps_last_battle', None)
+                if last_battle is not None:
+                    selected_choice, battle = last_battle
+                else:
+                    battle = None
+            
+            if battle is not None:
+                if battle.result == "draw":
                     result_text = "🤝 It's a draw!"
                     result_color = "blue"
-                    score = 5
-                elif result == "win":
-                    game['player_wins'] += 1
+                elif battle.result == "win":
                     result_text = "🎉 You win!"
                     result_color = "green"
-                    score = 10
                 else:
-                    game['computer_wins'] += 1
                     result_text = "🤖 Computer wins!"
                     result_color = "red"
-                    score = 0
-                
-                self.update_stats('Rock Paper Scissors', score)
                 
                 # Display result with animation
                 computer_emoji = {"rock": "🪨", "paper": "📄", "scissors": "✂️"}
+                computer_choice = battle.computer
                 
                 st.markdown(f"""
                 <div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #ffeaa7, #fab1a0); border-radius: 15px; margin: 1rem 0;">
@@ -468,34 +437,33 @@ def rock_paper_scissors(self):
                     <h1 style="color: {result_color};">{result_text}</h1>
                 </div>
                 """, unsafe_allow_html=True)
-                
-                game['game_history'].append({
-                    'player': player_choice,
-                    'computer': computer_choice,
-                    'result': result
-                })
+        
+        with scoreboard:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("🎮 Your Wins", game.player_wins)
+            with col2:
+                st.metric("🤖 Computer Wins", game.computer_wins)
+            with col3:
+                st.metric("🤝 Draws", game.draws)
         
         # Game history
-        if game['game_history']:
+        if game.game_history:
             st.markdown("### 📊 Recent Games:")
-            recent_games = game['game_history'][-5:]  # Show last 5 games
+            import pandas as pd  # deferred: only needed once there is history to show
+            
+            recent_games = game.game_history[-5:]  # Show last 5 games
             df = pd.DataFrame(recent_games)
             st.dataframe(df, use_container_width=True)
     
     def determine_rps_winner(self, player_choice, computer_choice):
         """Determine Rock Paper Scissors winner"""
-        if player_choice == computer_choice:
-            return "draw"
-        elif (player_choice == "rock" and computer_choice == "scissors") or \
-             (player_choice == "paper" and computer_choice == "rock") or \
-             (player_choice == "scissors" and computer_choice == "paper"):
-            return "win"
-        else:
-            return "lose"
+        return engine.determine_rps_winner(player_choice, computer_choice)
 
    #Word_scramble 
     
 
+    @metrics.timed("page_seconds", page="word_scramble")
     def word_scramble_game(self):
         """
         Beautiful Word Scramble Game with Streamlit
@@ -504,58 +472,45 @@ def rock_paper_scissors(self):
         st.markdown("## 🔤 Word Scramble Game")
         st.markdown("*Unscramble the letters to form the original word!*")
         
-        # Word lists
-        word_lists = {
-            "Easy 🟢": ["cat", "dog", "sun", "car", "book", "tree", "fish", "bird"],
-            "Medium 🟡": ["python", "computer", "keyboard", "program", "function", "variable"],
-            "Hard 🔴": ["programming", "algorithm", "collaboration", "development", "repository"]
-        }
+        # Shared dictionary, loaded once per process
+        corpus = word_corpus.load_corpus()
         
         # Initialize game state
         if 'scramble_game' not in st.session_state:
-            st.session_state.scramble_game = {
-                'current_word': '',
-                'scrambled_word': '',
-                'score': 0,
-                'round': 1,
-                'total_rounds': 5,
-                'difficulty': 'Easy 🟢',
-                'start_time': 0,
-                'game_active': False
-            }
+            st.session_state.scramble_game = engine.ScrambleState(difficulty='Easy 🟢')
         
         game = st.session_state.scramble_game
         
         # Difficulty selection
         col1, col2 = st.columns([2, 1])
         with col1:
-            difficulty = st.selectbox("Choose Difficulty:", list(word_lists.keys()), 
-                                    index=list(word_lists.keys()).index(game['difficulty']))
-            game['difficulty'] = difficulty
+            difficulty = st.selectbox("Choose Difficulty:", SCRAMBLE_LEVELS, 
+                                    index=SCRAMBLE_LEVELS.index(game.difficulty))
+            game.difficulty = difficulty
+            words = corpus.words(SCRAMBLE_DIFFICULTIES[difficulty])
         
         with col2:
-            st.metric("Current Score", game['score'])
+            st.metric("Current Score", game.score)
         
         # Game controls
-        if not game['game_active']:
+        if not game.game_active:
             if st.button("🎮 Start New Game", use_container_width=True):
-                game['current_word'] = random.choice(word_lists[difficulty])
-                game['scrambled_word'] = self.scramble_word(game['current_word'])
-                game['start_time'] = time.time()
-                game['game_active'] = True
-                game['round'] = 1
-                game['score'] = 0
+                engine.scramble_start(game, words, corpus=corpus)
+                st.session_state.scramble_feedback = []
                 st.rerun()
         
-        if game['game_active']:
+        if game.game_active:
             # Progress indicator
-            progress = (game['round'] - 1) / game['total_rounds']
-            st.progress(progress, text=f"Round {game['round']}/{game['total_rounds']}")
+            progress = (game.round - 1) / game.total_rounds
+            st.progress(progress, text=f"Round {game.round}/{game.total_rounds}")
+            
+            # Feedback on the previous round stays up until the next answer
+            self.show_feedback(st.session_state.get('scramble_feedback', []))
             
             # Display scrambled word
             st.markdown(f"""
             <div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #a8edea, #fed6e3); border-radius: 15px; margin: 2rem 0;">
-                <h1 style="font-size: 3rem; letter-spacing: 10px; color: #2d3436;">{game['scrambled_word'].upper()}</h1>
+                <h1 style="font-size: 3rem; letter-spacing: 10px; color: #2d3436;">{game.scrambled_word.upper()}</h1>
                 <p>Unscramble this word!</p>
             </div>
             """, unsafe_allow_html=True)
@@ -563,54 +518,49 @@ def rock_paper_scissors(self):
             # Input and submit
             col1, col2 = st.columns([3, 1])
             with col1:
-                user_guess = st.text_input("Your guess:", key=f"scramble_guess_{game['round']}")
+                user_guess = st.text_input("Your guess:", key=f"scramble_guess_{game.round}")
             
             with col2:
                 if st.button("✅ Submit"):
-                    if user_guess.lower() == game['current_word'].lower():
-                        time_taken = time.time() - game['start_time']
-                        points = max(20 - int(time_taken), 5)
-                        game['score'] += points
-                        
-                        st.success(f"🎉 Correct! +{points} points")
-                        
-                        if game['round'] < game['total_rounds']:
-                            game['round'] += 1
-                            game['current_word'] = random.choice(word_lists[difficulty])
-                            game['scrambled_word'] = self.scramble_word(game['current_word'])
-                            game['start_time'] = time.time()
-                            time.sleep(1)
-                            st.rerun()
-                        else:
-                            game['game_active'] = False
-                            self.update_stats('Word Scramble', game['score'])
+                    result = engine.scramble_step(game, user_guess, words, corpus=corpus)
+                    if result.correct:
+                        feedback = [('success', f"🎉 Correct! +{result.points} points")]
+                    else:
+                        feedback = [('error', f"❌ Wrong! The word was: {result.answer}")]
+                    
+                    if not result.finished:
+                        # Move on right away; the feedback is shown above the next word
+                        st.session_state.scramble_feedback = feedback
+                        st.rerun()
+                    else:
+                        self.show_feedback(feedback)
+                        self.update_stats('Word Scramble', game.score)
+                        if result.correct:
                             st.markdown('<div class="winner-animation">🏆 Game Complete!</div>', unsafe_allow_html=True)
                             st.balloons()
-                    else:
-                        st.error(f"❌ Wrong! The word was: {game['current_word']}")
-                        if game['round'] < game['total_rounds']:
-                            game['round'] += 1
-                            game['current_word'] = random.choice(word_lists[difficulty])
-                            game['scrambled_word'] = self.scramble_word(game['current_word'])
-                            game['start_time'] = time.time()
-                            time.sleep(1)
-                            st.rerun()
-                        else:
-                            game['game_active'] = False
-                            self.update_stats('Word Scramble', game['score'])
+    
+    def show_feedback(self, feedback):
+        """Render ``(kind, message)`` pairs, e.g. ``('success', '...')``.
+
+        ``'winner'`` shows the message as the winner banner and
+        ``'balloons'`` (message ignored) launches balloons.
+        """
+        for kind, message in feedback:
+            if kind == 'winner':
+                st.markdown(f'<div class="winner-animation">{message}</div>', unsafe_allow_html=True)
+            elif kind == 'balloons':
+                st.balloons()
+            else:
+                getattr(st, kind)(message)
     
     def scramble_word(self, word):
         """Scramble the letters of a word"""
-        scrambled = list(word)
-        random.shuffle(scrambled)
-        # Ensure the scrambled word is different from original
-        while ''.join(scrambled) == word and len(word) > 1:
-            random.shuffle(scrambled)
-        return ''.join(scrambled)
+        return engine.scramble_word(word)
     
     
     ## quiz gamee
     
+    @metrics.timed("page_seconds", page="quiz")
     def simple_quiz_game(self):
         """
         Beautiful Quiz Game with Streamlit
@@ -619,139 +569,35 @@ def rock_paper_scissors(self):
         st.markdown("## 🧠 Quiz Game")
         st.markdown("*Test your knowledge with our interactive quiz!*")
         
-        # Quiz data
-        quiz_data = {
-            "General Knowledge 🌍": [
-                {
-                    "question": "What is the capital of France?",
-                    "options": ["London", "Berlin", "Paris", "Madrid"],
-                    "answer": 2,
-                    "explanation": "Paris is the capital and largest city of France."
-                },
-                {
-                    "question": "Which planet is known as the Red Planet?",
-                    "options": ["Venus", "Mars", "Jupiter", "Saturn"],
-                    "answer": 1,
-                    "explanation": "Mars is called the Red Planet due to iron oxide on its surface."
-                },
-                {
-                    "question": "What is 7 × 8?",
-                    "options": ["54", "56", "58", "64"],
-                    "answer": 1,
-                    "explanation": "7 × 8 = 56"
-                }
-            ],
-            "Programming 💻": [
-                {
-                    "question": "Which language is primarily used for web development?",
-                    "options": ["Python", "JavaScript", "Java", "C++"],
-                    "answer": 1,
-                    "explanation": "JavaScript is the primary language for client-side web development."
-                },
-                {
-                    "question": "What does 'HTML' stand for?",
-                    "options": ["High Tech Modern Language", "HyperText Markup Language", 
-                             "Home Tool Markup Language", "Hyperlink Text Management Language"],
-                    "answer": 1,
-                    "explanation": "HTML stands for HyperText Markup Language."
-                },
-                {
-                    "question": "Which is a version control system?",
-                    "options": ["Git", "Python", "MySQL", "CSS"],
-                    "answer": 0,
-                    "explanation": "Git is a distributed version control system."
-                }
-            ]
-        }
+        # Shared, preloaded question bank
+        quiz_bank = content.load_quiz_bank()
         
         # Initialize quiz state
         if 'quiz_game' not in st.session_state:
-            st.session_state.quiz_game = {
-                'category': 'General Knowledge 🌍',
-                'current_question': 0,
-                'score': 0,
-                'answers': [],
-                'quiz_active': False,
-                'quiz_complete': False
-            }
+            st.session_state.quiz_game = engine.QuizState(category='General Knowledge 🌍')
         
         game = st.session_state.quiz_game
         
         # Category selection
-        if not game['quiz_active']:
+        if not game.quiz_active:
             col1, col2 = st.columns([2, 1])
             with col1:
-                category = st.selectbox("Choose Quiz Category:", list(quiz_data.keys()))
-                game['category'] = category
+                category = st.selectbox("Choose Quiz Category:", quiz_bank.categories)
+                game.category = category
             
             with col2:
                 if st.button("🚀 Start Quiz", use_container_width=True):
-                    game['quiz_active'] = True
-                    game['current_question'] = 0
-                    game['score'] = 0
-                    game['answers'] = []
-                    game['quiz_complete'] = False
+                    engine.quiz_start(game, category, quiz_bank.by_category[category])
+                    st.session_state.quiz_feedback = []
                     st.rerun()
         
-        if game['quiz_active'] and not game['quiz_complete']:
-            questions = quiz_data[game['category']]
-            current_q = questions[game['current_question']]
-            
-            # Progress bar
-            progress = (game['current_question']) / len(questions)
-            st.progress(progress, text=f"Question {game['current_question'] + 1}/{len(questions)}")
-            
-            # Question display
-            st.markdown(f"""
-            <div style="background: linear-gradient(135deg, #74b9ff, #0984e3); padding: 2rem; border-radius: 15px; margin: 2rem 0;">
-                <h2 style="color: white; text-align: center;">Question {game['current_question'] + 1}</h2>
-                <h3 style="color: white; text-align: center;">{current_q['question']}</h3>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Answer options
-            selected_answer = st.radio(
-                "Choose your answer:",
-                current_q['options'],
-                key=f"quiz_answer_{game['current_question']}"
-            )
-            
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col2:
-                if st.button("📝 Submit Answer", use_container_width=True):
-                    selected_index = current_q['options'].index(selected_answer)
-                    is_correct = selected_index == current_q['answer']
-                    
-                    if is_correct:
-                        game['score'] += 10
-                        st.success("✅ Correct! " + current_q['explanation'])
-                    else:
-                        correct_answer = current_q['options'][current_q['answer']]
-                        st.error(f"❌ Wrong! The correct answer was: {correct_answer}")
-                        st.info(current_q['explanation'])
-                    
-                    game['answers'].append({
-                        'question': current_q['question'],
-                        'selected': selected_answer,
-                        'correct': current_q['options'][current_q['answer']],
-                        'is_correct': is_correct
-                    })
-                    
-                    if game['current_question'] < len(questions) - 1:
-                        game['current_question'] += 1
-                        time.sleep(2)
-                        st.rerun()
-                    else:
-                        game['quiz_complete'] = True
-                        game['quiz_active'] = False
-                        st.rerun()
+        if game.quiz_active and not game.quiz_complete:
+            self.quiz_question_panel(game)
         
         # Quiz results
-        if game['quiz_complete']:
-            total_questions = len(quiz_data[game['category']])
-            percentage = (game['score'] / (total_questions * 10)) * 100
-            
-            self.update_stats('Quiz Game', game['score'])
+        if game.quiz_complete:
+            total_questions = len(game.questions)
+            percentage = (game.score / (total_questions * engine.QUIZ_POINTS)) * 100
             
             # Results display with beautiful styling
             if percentage >= 80:
@@ -767,7 +613,7 @@ def rock_paper_scissors(self):
             st.markdown(f"""
             <div style="text-align: center; padding: 3rem; background: linear-gradient(135deg, #a8edea, #fed6e3); border-radius: 20px; margin: 2rem 0;">
                 <h1>🏆 Quiz Complete!</h1>
-                <h2>Score: {game['score']}/{total_questions * 10}</h2>
+                <h2>Score: {game.score}/{total_questions * engine.QUIZ_POINTS}</h2>
                 <h2>Percentage: {percentage:.1f}%</h2>
                 <h1 style="color: {color};">{grade}</h1>
             </div>
@@ -775,7 +621,7 @@ def rock_paper_scissors(self):
             
             # Results breakdown
             st.markdown("### 📊 Detailed Results:")
-            for i, answer in enumerate(game['answers'], 1):
+            for i, answer in enumerate(game.answers, 1):
                 icon = "✅" if answer['is_correct'] else "❌"
                 st.write(f"{icon} **Q{i}:** {answer['question']}")
                 st.write(f"Your answer: {answer['selected']}")
@@ -787,44 +633,100 @@ def rock_paper_scissors(self):
                 del st.session_state.quiz_game
                 st.rerun()
     
+    @st.fragment
+    @metrics.timed("page_seconds", page="quiz_question")
+    def quiz_question_panel(self, game):
+        """Current quiz question; answering reruns only this panel"""
+        questions = game.questions
+        current_q = questions[game.current_question]
+        
+        # Progress bar
+        progress = (game.current_question) / len(questions)
+        st.progress(progress, text=f"Question {game.current_question + 1}/{len(questions)}")
+        
+        # Feedback on the previous question stays up until the next answer
+        self.show_feedback(st.session_state.get('quiz_feedback', []))
+        
+        # Question display
+        st.markdown(f"""
+        <div style="background: linear-gradient(135deg, #74b9ff, #0984e3); padding: 2rem; border-radius: 15px; margin: 2rem 0;">
+            <h2 style="color: white; text-align: center;">Question {game.current_question + 1}</h2>
+            <h3 style="color: white; text-align: center;">{current_q.question}</h3>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Answer options
+        selected_answer = st.radio(
+            "Choose your answer:",
+            current_q.options,
+            key=f"quiz_answer_{game.current_question}"
+        )
+        
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            if st.button("📝 Submit Answer", use_container_width=True):
+                result = engine.quiz_step(game, current_q.options.index(selected_answer))
+                
+                if not result.finished:
+                    # Move on right away; the feedback is shown above the next question
+                    if result.is_correct:
+                        st.session_state.quiz_feedback = [('success', "✅ Correct! " + result.explanation)]
+                    else:
+                        st.session_state.quiz_feedback = [
+                            ('error', f"❌ Wrong! The correct answer was: {result.correct_answer}"),
+                            ('info', result.explanation)
+                        ]
+                    rerun_fragment()
+                else:
+                    # Record the finished quiz once, not on every rerun of the
+                    # results; a full rerun shows them and the new header totals
+                    self.update_stats('Quiz Game', game.score)
+                    st.rerun()
+    
 #tic tac toe
+    @st.fragment
+    @metrics.timed("page_seconds", page="tic_tac_toe")
     def tic_tac_toe(self):
         """
         Beautiful Tic-Tac-Toe with Streamlit
         Author: Rahul Trimukhe
         """
         st.markdown("## ❌⭕ Tic-Tac-Toe")
-        st.markdown("*Classic game for two players!*")
+        st.markdown("*Classic game for two players, or take on the computer!*")
         
         # Initialize game state
         if 'ttt_game' not in st.session_state:
-            st.session_state.ttt_game = {
-                'board': [' '] * 9,
-                'current_player': 'X',
-                'game_over': False,
-                'winner': None,
-                'x_wins': 0,
-                'o_wins': 0,
-                'draws': 0
-            }
+            st.session_state.ttt_game = engine.TicTacToeState()
         
         game = st.session_state.ttt_game
         
+        # Opponent selection; the computer always plays O
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            mode = st.radio("Opponent:", ["👥 Two Players", "🤖 vs Computer"], horizontal=True, key="ttt_mode")
+        with col2:
+            difficulty = st.selectbox("Difficulty:", list(ttt_ai.DIFFICULTY_RANDOMNESS), index=2,
+                                      key="ttt_difficulty", disabled=mode == "👥 Two Players")
+        computer_player = 'O' if mode == "🤖 vs Computer" else None
+        if computer_player != game.computer_player:
+            game.computer_player = computer_player
+            engine.ttt_reset(game)
+        
         # Score display
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("❌ X Wins", game['x_wins'])
+            st.metric("❌ X Wins", game.x_wins)
         with col2:
-            st.metric("⭕ O Wins", game['o_wins'])
+            st.metric("⭕ O Wins", game.o_wins)
         with col3:
-            st.metric("🤝 Draws", game['draws'])
+            st.metric("🤝 Draws", game.draws)
         
         # Current player indicator
-        if not game['game_over']:
+        if not game.game_over:
             st.markdown(f"""
             <div style="text-align: center; padding: 1rem; background: linear-gradient(135deg, #6c5ce7, #a29bfe); 
                         border-radius: 10px; margin: 1rem 0;">
-                <h2 style="color: white;">Current Player: {game['current_player']}</h2>
+                <h2 style="color: white;">Current Player: {game.current_player}</h2>
             </div>
             """, unsafe_allow_html=True)
         
@@ -832,11 +734,12 @@ def rock_paper_scissors(self):
         st.markdown("### Game Board:")
         
         # Create 3x3 grid
+        board = game.board
         for row in range(3):
             cols = st.columns(3)
             for col in range(3):
                 position = row * 3 + col
-                cell_value = game['board'][position]
+                cell_value = board[position]
                 
                 # Display cell content with beautiful styling
                 if cell_value == ' ':
@@ -853,135 +756,188 @@ def rock_paper_scissors(self):
                     if st.button(
                         display_value,
                         key=f"cell_{position}",
-                        disabled=game['board'][position] != ' ' or game['game_over'],
+                        disabled=cell_value != ' ' or game.game_over,
                         use_container_width=True
                     ):
-                        game['board'][position] = game['current_player']
-                        
-                        # Check for winner
-                        winner = self.check_ttt_winner(game['board'])
-                        if winner:
-                            game['winner'] = winner
-                            game['game_over'] = True
-                            if winner == 'X':
-                                game['x_wins'] += 1
-                            else:
-                                game['o_wins'] += 1
-                            self.update_stats('Tic-Tac-Toe', 10)
-                        elif ' ' not in game['board']:
-                            game['game_over'] = True
-                            game['winner'] = 'Draw'
-                            game['draws'] += 1
-                            self.update_stats('Tic-Tac-Toe', 5)
-                        else:
-                            game['current_player'] = 'O' if game['current_player'] == 'X' else 'X'
+                        result = engine.ttt_step(game, position)
+                        if result.score is None:
+                            # Table lookup, so the reply is instant
+                            result = ttt_ai.computer_turn(game, difficulty) or result
+                        if result.score is not None:
+                            # Finished game: full rerun so the header cards catch up
+                            self.update_stats('Tic-Tac-Toe', result.score)
+                            st.rerun()
                         
-                        st.rerun()
+                        rerun_fragment()
         
         # Game result
-        if game['game_over']:
-            if game['winner'] == 'Draw':
+        if game.game_over:
+            if game.winner == 'Draw':
                 st.markdown('<div class="winner-animation">🤝 It\'s a Draw!</div>', unsafe_allow_html=True)
             else:
-                st.markdown(f'<div class="winner-animation">🎉 Player {game["winner"]} Wins!</div>', unsafe_allow_html=True)
-                st.balloons()
+                if game.winner == game.computer_player:
+                    st.markdown('<div class="winner-animation">🤖 The Computer Wins!</div>', unsafe_allow_html=True)
+                else:
+                    st.markdown(f'<div class="winner-animation">🎉 Player {game.winner} Wins!</div>', unsafe_allow_html=True)
+                    st.balloons()
             
             if st.button("🔄 New Game", use_container_width=True):
-                game['board'] = [' '] * 9
-                game['current_player'] = 'X'
-                game['game_over'] = False
-                game['winner'] = None
-                st.rerun()
+                engine.ttt_reset(game)
+                rerun_fragment()
     
     def check_ttt_winner(self, board):
         """Check for Tic-Tac-Toe winner"""
-        win_combinations = [
-            [0, 1, 2], [3, 4, 5], [6, 7, 8],  # rows
-            [0, 3, 6], [1, 4, 7], [2, 5, 8],  # columns
-            [0, 4, 8], [2, 4, 6]              # diagonals
-        ]
-        
-        for combo in win_combinations:
-            if board[combo[0]] == board[combo[1]] == board[combo[2]] != ' ':
-                return board[combo[0]]
-        return None
+        return engine.check_ttt_winner(board)
     
 
     ###Written by Arya
+    @metrics.timed("update_stats_seconds")
     def update_stats(self, game_name, score):
         """Update player statistics"""
-        st.session_state.game_stats['games_played'] += 1
-        st.session_state.game_stats['total_score'] += score
+        metrics.REGISTRY.inc("games_recorded_total", game=game_name)
+        # One session state lookup; each one goes through Streamlit's proxies
+        stats = st.session_state.game_stats
+        stats['games_played'] += 1
+        stats['total_score'] += score
         
         # Add to play history
-        st.session_state.game_stats['play_history'].append({
-            'game': game_name,
-            'score': score,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        })
-        
-        # Update favorite game based on frequency
-        game_counts = {}
-        for game_record in st.session_state.game_stats['play_history']:
-            game_counts[game_record['game']] = game_counts.get(game_record['game'], 0) + 1
-        
-        if game_counts:
-            st.session_state.game_stats['favorite_game'] = max(game_counts, key=game_counts.get)
+        stats['play_history'].append(game_name, score)
+        stats['version'] += 1
+        
+        # Persist asynchronously; the store batches writes in the background
+        store = get_stats_store()
+        if store is not None and stats['player_id']:
+            store.record(stats['player_id'], game_name, score)
+        
+        # Update per-game counters and the favorite game incrementally
+        game_counts = stats['game_counts']
+        game_counts[game_name] = game_counts.get(game_name, 0) + 1
+        stats['game_score_sums'][game_name] = stats['game_score_sums'].get(game_name, 0) + score
+        get_leaderboard().submit(stats['player_id'] or stats['session_id'], game_name,
+                                 stats['game_score_sums'][game_name], restore=stats['game_score_sums'])
+        stats['game_min_scores'][game_name] = min(stats['game_min_scores'].get(game_name, score), score)
+        stats['game_max_scores'][game_name] = max(stats['game_max_scores'].get(game_name, score), score)
+        if stats['min_score'] is None or score < stats['min_score']:
+            stats['min_score'] = score
+        if stats['max_score'] is None or score > stats['max_score']:
+            stats['max_score'] = score
+        
+        # Ties go to the game that was played first, as dict insertion order did before
+        favorite = stats['favorite_game']
+        if favorite not in game_counts:
+            stats['favorite_game'] = game_name
+        elif game_counts[game_name] > game_counts[favorite] or (
+            game_counts[game_name] == game_counts[favorite]
+            and list(game_counts).index(game_name) < list(game_counts).index(favorite)
+        ):
+            stats['favorite_game'] = game_name
+    
+    def average_score(self, game_name=None):
+        """Mean score overall or for one game, from the running totals"""
+        stats = st.session_state.game_stats
+        if game_name is None:
+            count, total = stats['games_played'], stats['total_score']
+        else:
+            count = stats['game_counts'].get(game_name, 0)
+            total = stats['game_score_sums'].get(game_name, 0)
+        return total / count if count else 0
     
+    @metrics.timed("page_seconds", page="analytics")
     def display_analytics(self):
         """Display beautiful game analytics"""
         st.markdown("## 📊 Game Analytics")
         
-        if not st.session_state.game_stats['play_history']:
+        stats = st.session_state.game_stats
+        history = stats['play_history']
+        if len(history):
+            # The file is only built when the button is clicked
+            st.download_button(
+                "💾 Export history (Parquet)",
+                data=lambda: history_io.export_bytes(history),
+                file_name="play_history.parquet",
+                mime=history_io.MIME_TYPES['parquet'],
+                on_click="ignore"
+            )
+        uploaded = st.file_uploader(
+            "📂 Analyze an exported history", type=list(history_io.FORMATS), key='history_upload'
+        )
+        
+        store = get_stats_store()
+        if uploaded is not None:
+            # Same vectorized figures as live data, built from the file's batches
+            try:
+                figures = cached_file_figures(uploaded.file_id, history_limit(), uploaded)
+            except ValueError as error:
+                st.error(f"❌ Could not read {uploaded.name}: {error}")
+                return
+            st.caption(f"Showing {uploaded.name}")
+        elif not stats['games_played']:
             st.info("🎮 Play some games to see your analytics!")
             return
-        
-        # Create DataFrames for analysis
-        df = pd.DataFrame(st.session_state.game_stats['play_history'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        elif store is not None and stats['player_id']:
+            # Aggregate queries against the store, not the in-session history
+            figures = cached_store_figures(stats['player_id'], stats['session_id'], stats['version'], store)
+        else:
+            figures = cached_analytics_figures(stats['session_id'], stats['version'], history)
         
         col1, col2 = st.columns(2)
         
         # Games played by type
         with col1:
-            game_counts = df['game'].value_counts()
-            fig_pie = px.pie(
-                values=game_counts.values, 
-                names=game_counts.index, 
-                title="🎯 Games Played by Type",
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-            st.plotly_chart(fig_pie, use_container_width=True)
+            st.plotly_chart(figures['pie'], use_container_width=True)
         
         # Score progression over time
         with col2:
-            df_sorted = df.sort_values('timestamp')
-            df_sorted['cumulative_score'] = df_sorted['score'].cumsum()
-            
-            fig_line = px.line(
-                df_sorted, 
-                x='timestamp', 
-                y='cumulative_score',
-                title='📈 Score Progression Over Time',
-                markers=True
-            )
-            fig_line.update_layout(
-                xaxis_title="Time",
-                yaxis_title="Cumulative Score",
-                showlegend=False
-            )
-            st.plotly_chart(fig_line, use_container_width=True)
+            st.plotly_chart(figures['line'], use_container_width=True)
+        
+        col3, col4 = st.columns(2)
+        
+        # Median and 95th percentile score per game
+        with col3:
+            st.plotly_chart(figures['quantiles'], use_container_width=True)
+        
+        # Games played per time bucket
+        with col4:
+            st.plotly_chart(figures['activity'], use_container_width=True)
         
         # Recent games table
         st.markdown("### 🕒 Recent Games")
-        recent_df = df.tail(10).sort_values('timestamp', ascending=False)
         st.dataframe(
-            recent_df[['game', 'score', 'timestamp']], 
+            figures['recent'], 
             use_container_width=True,
             hide_index=True
         )
     
+    def display_metrics(self):
+        """Admin-only view of the process-wide timing metrics"""
+        st.markdown("## 📈 Metrics")
+        
+        registry = metrics.REGISTRY
+        if not registry.enabled:
+            st.info(f"⏱️ Instrumentation is off. Set {metrics.METRICS_ENV}=1 to collect timings.")
+            return
+        
+        histograms, counters = registry.snapshot()
+        st.markdown("### ⏱️ Timings (ms)")
+        st.dataframe(
+            [{**row, 'labels': ", ".join(f"{k}={v}" for k, v in row['labels'].items())} for row in histograms],
+            use_container_width=True,
+            hide_index=True
+        )
+        st.markdown("### 🔢 Counters")
+        st.dataframe(
+            [{**row, 'labels': ", ".join(f"{k}={v}" for k, v in row['labels'].items())} for row in counters],
+            use_container_width=True,
+            hide_index=True
+        )
+        
+        path = os.environ.get(metrics.METRICS_FILE_ENV)
+        if path:
+            st.caption(f"Written to `{path}` at most every {metrics.DUMP_INTERVAL:g}s.")
+        st.download_button("💾 Download (Prometheus text)", registry.to_prometheus(),
+                           file_name="minigames.prom", mime="text/plain")
+    
+    @metrics.timed("page_seconds", page="home")
     def display_home_page(self):
         """Display simplified and elegant home page"""
         st.markdown("""
@@ -1027,14 +983,17 @@ def rock_paper_scissors(self):
             recent_game = st.session_state.game_stats['play_history'][-1]
             st.success(f"🎮 Last played: {recent_game['game']} - Score: {recent_game['score']} points!")
     
+    @metrics.timed("rerun_seconds")
     def run(self):
         """Main application runner"""
+        configure_page()
+        
         # Enhanced sidebar navigation
         selected_game = self.display_enhanced_sidebar()
         
-        # Display header on all pages except analytics
-        if selected_game != "analytics":
-            self.display_header()
+        # Display header on all pages except analytics and metrics
+        if selected_game not in ("analytics", "metrics"):
+            self.display_header(GAME_NAMES.get(selected_game))
         
         # Game routing
         if selected_game == "home":
@@ -1051,6 +1010,8 @@ def rock_paper_scissors(self):
             self.tic_tac_toe()
         elif selected_game == "analytics":
             self.display_analytics()
+        elif selected_game == "metrics":
+            self.display_metrics()
         
         # Enhanced footer
         st.markdown("""
@@ -1059,6 +1020,9 @@ def rock_paper_scissors(self):
             <em>Collaborative Coding Project - Beautiful Gaming Experience</em>
         </div>
         """, unsafe_allow_html=True)
+        
+        # No-op unless metrics and a metrics file are configured
+        metrics.REGISTRY.maybe_dump()
 
 
 # Application entry point
@@ -0,0 +1,216 @@
+"""
+Timing Metrics
+==============
+Opt-in, process-wide timing histograms and counters for the app's hot
+paths (reruns, pages, ``update_stats``, analytics builds).
+
+Instrumentation is off unless ``MINIGAMES_METRICS=1`` is set. While off, a
+``timed`` function costs one attribute check per call and nothing is
+recorded. While on, each observation takes a lock and increments one
+fixed bucket, so the registry's size depends only on the number of
+metric/label combinations, never on traffic.
+
+The registry can be rendered in the Prometheus text exposition format and
+written to ``MINIGAMES_METRICS_FILE`` (for a node-exporter textfile
+collector, for example); ``main.py`` does that at most every
+``DUMP_INTERVAL`` seconds.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Dict, Tuple
+
+METRICS_ENV = "MINIGAMES_METRICS"
+METRICS_FILE_ENV = "MINIGAMES_METRICS_FILE"
+METRIC_PREFIX = "minigames_"
+DUMP_INTERVAL = 10.0   # seconds between metrics file writes
+
+# Upper bounds (seconds) of the histogram buckets; the last bucket is +Inf
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Fixed-bucket histogram, like a Prometheus histogram"""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds=DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation within its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.bounds[index - 1] if index else 0.0
+                if index == len(self.bounds):
+                    # +Inf bucket: the best estimate is its lower bound
+                    return lower
+                return lower + (self.bounds[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.bounds[-1]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_labels(labels: LabelKey, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class MetricsRegistry:
+    """Thread-safe store of named, labelled histograms and counters"""
+
+    def __init__(self, enabled: bool = False, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._last_dump = 0.0
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def observe(self, name: str, value: float, **labels):
+        """Add one observation (e.g. a duration in seconds) to a histogram"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted((label, str(v)) for label, v in labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Increase a counter"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted((label, str(v)) for label, v in labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def timer(self, name: str, **labels):
+        """Context manager recording the duration of its block"""
+        if not self.enabled:
+            return nullcontext()
+        return self._timer(name, labels)
+
+    @contextmanager
+    def _timer(self, name, labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name: str, **labels):
+        """Decorator recording the duration of every call, including ones that raise"""
+        def decorate(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start, **labels)
+            return wrapper
+        return decorate
+
+    def snapshot(self):
+        """``(histograms, counters)`` as lists of plain dicts, for display"""
+        with self._lock:
+            histograms = [
+                {
+                    'metric': name,
+                    'labels': dict(labels),
+                    'count': histogram.count,
+                    'mean_ms': histogram.sum / histogram.count * 1000 if histogram.count else 0.0,
+                    'p50_ms': histogram.quantile(0.50) * 1000,
+                    'p95_ms': histogram.quantile(0.95) * 1000,
+                    'p99_ms': histogram.quantile(0.99) * 1000,
+                }
+                for (name, labels), histogram in sorted(self._histograms.items())
+            ]
+            counters = [
+                {'metric': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+        return histograms, counters
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            current = None
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                full_name = METRIC_PREFIX + name
+                if full_name != current:
+                    lines.append(f"# TYPE {full_name} histogram")
+                    current = full_name
+                cumulative = 0
+                for bound, count in zip((*histogram.bounds, "+Inf"), histogram.counts):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(f"{full_name}_bucket{_format_labels(labels, le)} {cumulative}")
+                lines.append(f"{full_name}_sum{_format_labels(labels)} {histogram.sum!r}")
+                lines.append(f"{full_name}_count{_format_labels(labels)} {histogram.count}")
+            for (name, labels), value in sorted(self._counters.items()):
+                full_name = METRIC_PREFIX + name
+                if full_name != current:
+                    lines.append(f"# TYPE {full_name} counter")
+                    current = full_name
+                lines.append(f"{full_name}{_format_labels(labels)} {value!r}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_prometheus(self, path):
+        """Atomically replace ``path`` with the current metrics"""
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(temporary, path)
+
+    def maybe_dump(self, path=None, interval: float = DUMP_INTERVAL) -> bool:
+        """Write the metrics file if enabled, configured and ``interval`` has passed"""
+        path = path or os.environ.get(METRICS_FILE_ENV)
+        if not self.enabled or not path:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_dump < interval:
+                return False
+            self._last_dump = now
+        self.write_prometheus(path)
+        return True
+
+
+# Shared by every session in the process
+REGISTRY = MetricsRegistry(enabled=os.environ.get(METRICS_ENV, "") not in ("", "0"))
+timed = REGISTRY.timed
+timer = REGISTRY.timer
@@ -0,0 +1,106 @@
+"""
+Rerun Latency Harness
+=====================
+Times full reruns of ``main.py`` with Streamlit's ``AppTest``.
+
+Every click reruns the whole script: page config and CSS, the sidebar, the
+header and the page body. This drives each page listed in the sidebar with
+a session pre-seeded with N recorded games (through the real
+``update_stats``) and reports p50/p95/p99 rerun times per page and size.
+
+    python rerun_bench.py                          # default sizes
+    python rerun_bench.py --sizes 0 1000 100000 --reruns 50 --json reruns.json
+
+Times include AppTest's own overhead (building and walking the element
+tree), which is roughly constant, so compare sizes and pages against each
+other rather than against browser timings.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks import quiet_streamlit, seeded_app
+
+ROOT = Path(__file__).parent
+DEFAULT_SIZES = (0, 1_000, 10_000, 100_000)
+DEFAULT_RERUNS = 20
+PERCENTILES = (50, 95, 99)
+
+
+def seeded_stats(size: int) -> dict:
+    """A ``game_stats`` dict with ``size`` games recorded by ``update_stats``"""
+    import streamlit as st
+    seeded_app(size)
+    stats = st.session_state.game_stats
+    st.session_state.clear()
+    return stats
+
+
+def page_rerun_times(size: int, reruns: int = DEFAULT_RERUNS, pages=None) -> dict:
+    """Rerun times in seconds, ``{page label: [seconds, ...]}``, for one seeded session"""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(ROOT / "main.py"), default_timeout=120)
+    app.session_state['game_stats'] = seeded_stats(size)
+    app.run()
+    quiet_streamlit()  # loggers created during the first run
+    navigation = app.sidebar.radio[0]
+
+    times = {}
+    for page in navigation.options:
+        if pages and not any(part in page for part in pages):
+            continue
+        # First visit builds the page's widgets and warms per-page caches
+        app.sidebar.radio[0].set_value(page).run()
+        if app.exception:
+            raise RuntimeError(f"{page}: {app.exception[0].message}")
+        samples = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            app.run()
+            samples.append(time.perf_counter() - start)
+        times[page] = samples
+    return times
+
+
+def summarize(samples) -> dict:
+    """p50/p95/p99 of a list of durations, in milliseconds"""
+    values = np.percentile(np.asarray(samples) * 1000, PERCENTILES)
+    return {f"p{q}": round(float(value), 3) for q, value in zip(PERCENTILES, values)}
+
+
+def run(sizes=DEFAULT_SIZES, reruns: int = DEFAULT_RERUNS, pages=None) -> dict:
+    """``{size: {page: {'p50': ms, 'p95': ms, 'p99': ms}}}``"""
+    quiet_streamlit()
+    return {
+        size: {page: summarize(samples) for page, samples in page_rerun_times(size, reruns, pages).items()}
+        for size in sizes
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="recorded games to seed each session with")
+    parser.add_argument('--reruns', type=int, default=DEFAULT_RERUNS, help="timed reruns per page")
+    parser.add_argument('-k', dest='pages', action='append', help="only pages whose label contains this")
+    parser.add_argument('--json', type=Path, help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.reruns, args.pages)
+    print(f"{'page':28} {'games':>8} " + " ".join(f"{f'p{q} ms':>9}" for q in PERCENTILES))
+    for size, pages in results.items():
+        for page, summary in pages.items():
+            print(f"{page:28} {size:8} " + " ".join(f"{value:9.1f}" for value in summary.values()))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
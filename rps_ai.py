@@ -0,0 +1,93 @@
+"""
+Rock Paper Scissors Computer Opponent
+=====================================
+An opt-in predictive opponent that learns the player's habits.
+
+``RPSModel`` keeps frequency counts of the player's moves and order-1..k
+Markov counts (what the player threw after each recent sequence of moves).
+Each round updates a fixed number of counters, and the number of contexts
+is bounded by 3 + 9 + ... + 3**k, so a battle costs the same on round
+10,000 as on round 1. The opponent predicts the next move from the longest
+context it has seen and plays the reply with the best expected score.
+"""
+
+import random
+
+from engine import RPS_CHOICES, RPS_INDEX, RPS_PAYOFF, RPS_SCORES, RPSState, rps_step
+
+OPPONENTS = ("🎲 Random", "🧠 Adaptive")
+
+# Chance that the adaptive opponent plays at random anyway, so it cannot
+# be steered into a fixed counter-pattern
+DEFAULT_EXPLORATION = 0.1
+
+class RPSModel:
+    """Incremental frequency and order-k Markov counts of the player's moves"""
+
+    __slots__ = ('order', 'rounds', 'frequency', 'transitions', '_recent')
+
+    def __init__(self, order: int = 2):
+        self.order = max(int(order), 1)
+        self.rounds = 0
+        self.frequency = [0, 0, 0]
+        # context (tuple of 1..order recent move indices, oldest first) ->
+        # counts of the move that followed it
+        self.transitions = {}
+        self._recent = ()
+
+    def observe(self, move: str):
+        """Record the player's move; O(order) counter updates"""
+        index = RPS_INDEX[move]
+        self.rounds += 1
+        self.frequency[index] += 1
+        recent = self._recent
+        for length in range(1, len(recent) + 1):
+            counts = self.transitions.get(recent[-length:])
+            if counts is None:
+                counts = self.transitions[recent[-length:]] = [0, 0, 0]
+            counts[index] += 1
+        self._recent = (recent + (index,))[-self.order:]
+
+    def predict(self):
+        """Estimated probabilities of the player's next move, or None before any data"""
+        recent = self._recent
+        for length in range(len(recent), 0, -1):
+            counts = self.transitions.get(recent[-length:])
+            if counts is not None:
+                break
+        else:
+            if not self.rounds:
+                return None
+            counts = self.frequency
+        total = sum(counts)
+        return tuple(count / total for count in counts)
+
+
+def choose_move(model: RPSModel, exploration: float = DEFAULT_EXPLORATION, rng=random) -> str:
+    """Pick the move with the best expected score against the predicted player move"""
+    probabilities = model.predict()
+    if probabilities is None or rng.random() < exploration:
+        return rng.choice(RPS_CHOICES)
+
+    best, best_value = [], float("-inf")
+    for computer, move in enumerate(RPS_CHOICES):
+        # Scores are from the player's side: the computer wants them low
+        value = -sum(p * RPS_SCORES[RPS_PAYOFF[player][computer]]
+                     for player, p in enumerate(probabilities))
+        if value > best_value + 1e-9:
+            best, best_value = [move], value
+        elif abs(value - best_value) <= 1e-9:
+            best.append(move)
+    return rng.choice(best)
+
+
+def play_round(state: RPSState, model: RPSModel, player_choice: str, adaptive: bool = True, rng=random):
+    """Play one battle against the random or adaptive opponent.
+
+    The model observes every round either way, so switching to the adaptive
+    opponent mid-session starts from everything the player has done so far.
+    """
+    computer_choice = choose_move(model, rng=rng) if adaptive else None
+    result = rps_step(state, player_choice, computer_choice, rng)
+    model.observe(player_choice)
+    return result
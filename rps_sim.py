@@ -0,0 +1,174 @@
+"""
+Rock Paper Scissors Strategy Simulator
+======================================
+Offline Monte Carlo evaluation of RPS strategies with NumPy.
+
+``simulate`` plays many independent matches side by side: every round is a
+handful of array operations over all matches at once, and the result of
+each battle is a lookup in the 3x3 payoff matrix from ``engine``. A million
+rounds (10,000 matches of 100 rounds) take well under a second.
+
+Strategies are small classes with the same three methods:
+
+* ``reset(n_matches, rng)`` before the first round,
+* ``play(round_number)`` returning one move index per match,
+* ``observe(own, opponent)`` with both sides' moves after each round.
+
+Results are reported from the player's side (the first strategy), using the
+scores ``update_stats`` would record for each battle.
+"""
+
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+from engine import RPS_PAYOFF, RPS_SCORES
+
+# SCORE_MATRIX[player, computer] is the player's score for the battle
+SCORE_MATRIX = np.array(
+    [[RPS_SCORES[result] for result in row] for row in RPS_PAYOFF], dtype=np.int64
+)
+# OUTCOME_MATRIX[player, computer] is 0 lose, 1 draw, 2 win
+OUTCOME_MATRIX = np.array(
+    [[("lose", "draw", "win").index(result) for result in row] for row in RPS_PAYOFF], dtype=np.int8
+)
+
+
+class RandomStrategy:
+    """Independent moves with fixed probabilities (uniform by default)"""
+
+    def __init__(self, probabilities: Sequence[float] = (1 / 3, 1 / 3, 1 / 3)):
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        self.cumulative = np.cumsum(probabilities / probabilities.sum())
+
+    def reset(self, n_matches: int, rng: np.random.Generator):
+        self.n_matches = n_matches
+        self.rng = rng
+
+    def play(self, round_number: int) -> np.ndarray:
+        draws = self.rng.random(self.n_matches)
+        return np.minimum(np.searchsorted(self.cumulative, draws, side='right'), 2).astype(np.int8)
+
+    def observe(self, own: np.ndarray, opponent: np.ndarray):
+        pass
+
+
+class CycleStrategy:
+    """Rock, paper, scissors, rock, ... from a random starting move per match"""
+
+    def __init__(self, step: int = 1):
+        self.step = step
+
+    def reset(self, n_matches: int, rng: np.random.Generator):
+        self.start = rng.integers(0, 3, n_matches, dtype=np.int8)
+
+    def play(self, round_number: int) -> np.ndarray:
+        return ((self.start + self.step * round_number) % 3).astype(np.int8)
+
+    def observe(self, own: np.ndarray, opponent: np.ndarray):
+        pass
+
+
+class AdaptiveStrategy:
+    """Vectorized ``rps_ai`` opponent: frequency and order-1..k Markov counts.
+
+    Counts are kept per match in arrays of shape ``(n_matches, 3**length, 3)``
+    with the context encoded in base 3, so one round is a constant number of
+    array updates whatever the round number.
+    """
+
+    def __init__(self, order: int = 2, exploration: float = 0.1):
+        self.order = max(int(order), 1)
+        self.exploration = exploration
+
+    def reset(self, n_matches: int, rng: np.random.Generator):
+        self.n_matches = n_matches
+        self.rng = rng
+        self.rounds = 0
+        self.frequency = np.zeros((n_matches, 3), dtype=np.int32)
+        self.transitions = [np.zeros((n_matches, 3 ** length, 3), dtype=np.int32)
+                            for length in range(1, self.order + 1)]
+        # contexts[length - 1] is the base-3 code of the last `length` moves
+        self.contexts = np.zeros((self.order, n_matches), dtype=np.int64)
+        self.matches = np.arange(n_matches)
+
+    def _predicted_counts(self) -> np.ndarray:
+        counts = self.frequency.astype(np.float64)
+        # Longer contexts override shorter ones wherever they have been seen
+        for length in range(1, min(self.rounds, self.order) + 1):
+            context_counts = self.transitions[length - 1][self.matches, self.contexts[length - 1]]
+            seen = context_counts.sum(axis=1) > 0
+            counts[seen] = context_counts[seen]
+        return counts
+
+    def play(self, round_number: int) -> np.ndarray:
+        counts = self._predicted_counts()
+        # Expected score the opponent would get against each of our moves;
+        # pick the lowest, breaking ties at random
+        expected = counts @ SCORE_MATRIX + self.rng.random((self.n_matches, 3)) * 1e-6
+        moves = expected.argmin(axis=1).astype(np.int8)
+        explore = (self.rng.random(self.n_matches) < self.exploration) | (counts.sum(axis=1) == 0)
+        moves[explore] = self.rng.integers(0, 3, int(explore.sum()), dtype=np.int8)
+        return moves
+
+    def observe(self, own: np.ndarray, opponent: np.ndarray):
+        self.frequency[self.matches, opponent] += 1
+        for length in range(1, min(self.rounds, self.order) + 1):
+            self.transitions[length - 1][self.matches, self.contexts[length - 1], opponent] += 1
+        self.rounds += 1
+        for length in range(1, self.order + 1):
+            self.contexts[length - 1] = (self.contexts[length - 1] * 3 + opponent) % 3 ** length
+
+
+class SimulationReport(NamedTuple):
+    rounds: int                     # battles played in total
+    win_rate: float
+    draw_rate: float
+    loss_rate: float
+    score_counts: dict              # update_stats score -> number of battles
+    mean_score: float               # per battle
+    match_totals: np.ndarray        # total update_stats score of each match
+    match_percentiles: dict         # 5/25/50/75/95th percentile of match_totals
+
+
+def simulate(player, computer, rounds: int = 100, matches: int = 10_000, seed=None) -> SimulationReport:
+    """Play ``matches`` independent matches of ``rounds`` battles, player vs computer"""
+    rng = np.random.default_rng(seed)
+    player.reset(matches, rng)
+    computer.reset(matches, rng)
+
+    outcome_counts = np.zeros(3, dtype=np.int64)
+    match_totals = np.zeros(matches, dtype=np.int64)
+    for round_number in range(rounds):
+        player_moves = player.play(round_number)
+        computer_moves = computer.play(round_number)
+        outcome_counts += np.bincount(OUTCOME_MATRIX[player_moves, computer_moves], minlength=3)
+        match_totals += SCORE_MATRIX[player_moves, computer_moves]
+        player.observe(player_moves, computer_moves)
+        computer.observe(computer_moves, player_moves)
+
+    total = max(rounds * matches, 1)
+    quantiles = (5, 25, 50, 75, 95)
+    losses, draws, wins = (int(count) for count in outcome_counts)
+    return SimulationReport(
+        rounds=rounds * matches,
+        win_rate=wins / total,
+        draw_rate=draws / total,
+        loss_rate=losses / total,
+        score_counts={
+            RPS_SCORES["win"]: wins,
+            RPS_SCORES["draw"]: draws,
+            RPS_SCORES["lose"]: losses,
+        },
+        mean_score=float(match_totals.sum()) / total,
+        match_totals=match_totals,
+        match_percentiles=dict(zip(quantiles, np.percentile(match_totals, quantiles).tolist())),
+    )
+
+
+STRATEGIES = {
+    "random": RandomStrategy,
+    "rock": lambda: RandomStrategy((1, 0, 0)),
+    "cycle": CycleStrategy,
+    "adaptive": AdaptiveStrategy,
+}
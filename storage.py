@@ -0,0 +1,246 @@
+"""
+Persistent Stats Store
+======================
+SQLite-backed storage for play records, so stats survive a browser refresh
+or a server restart.
+
+Records are queued by ``record()`` and written by a background thread in
+batches, one transaction per batch, so ``update_stats`` never waits on disk.
+Per-player, per-game totals are maintained in the same transaction, which
+keeps count/sum/favorite queries to a primary-key lookup, and the raw
+``plays`` table is indexed by ``(player, timestamp)`` for time-bucketed
+series and recent-games queries.
+
+A batch that fails to commit (a locked database, a full disk) is retried a
+few times with backoff and then dropped with an error logged; the writer
+keeps running either way.
+"""
+
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, List, NamedTuple, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plays (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    game TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    timestamp_ms INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_plays_player_time ON plays (player, timestamp_ms);
+CREATE TABLE IF NOT EXISTS game_totals (
+    player TEXT NOT NULL,
+    game TEXT NOT NULL,
+    plays INTEGER NOT NULL,
+    total_score INTEGER NOT NULL,
+    min_score INTEGER NOT NULL,
+    max_score INTEGER NOT NULL,
+    first_played_ms INTEGER NOT NULL,
+    PRIMARY KEY (player, game)
+) WITHOUT ROWID;
+"""
+
+UPSERT_TOTALS = """
+INSERT INTO game_totals (player, game, plays, total_score, min_score, max_score, first_played_ms)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (player, game) DO UPDATE SET
+    plays = plays + excluded.plays,
+    total_score = total_score + excluded.total_score,
+    min_score = MIN(min_score, excluded.min_score),
+    max_score = MAX(max_score, excluded.max_score)
+"""
+
+WRITE_ATTEMPTS = 3
+RETRY_DELAY = 0.1   # seconds before the first retry; doubles after each
+
+_STOP = object()
+logger = logging.getLogger(__name__)
+
+
+class GameTotals(NamedTuple):
+    plays: int
+    total_score: int
+    min_score: int
+    max_score: int
+
+
+class SQLiteStatsStore:
+    """Play records persisted to a SQLite database in WAL mode.
+
+    Safe to share between sessions and threads: writes go through a single
+    background writer, and each reading thread gets its own connection.
+    """
+
+    def __init__(self, path: str, batch_size: int = 500, linger: float = 0.05):
+        self.path = path
+        self.batch_size = batch_size
+        self.linger = linger
+        self._local = threading.local()
+        self._queue = queue.Queue()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+        self._writer = threading.Thread(target=self._write_loop, name="stats-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # ---- writes -----------------------------------------------------------
+
+    def record(self, player: str, game: str, score: int, timestamp_ms: int = None):
+        """Queue one finished game for writing; returns immediately"""
+        if timestamp_ms is None:
+            timestamp_ms = time.time_ns() // 1_000_000
+        self._queue.put((player, game, int(score), int(timestamp_ms)))
+
+    def flush(self):
+        """Block until every queued record has been written (or dropped).
+
+        Returns early, leaving the records queued, if the writer thread is
+        no longer running.
+        """
+        done = self._queue.all_tasks_done
+        with done:
+            while self._queue.unfinished_tasks and self._writer.is_alive():
+                done.wait(0.1)
+
+    def close(self):
+        """Flush pending records and stop the writer thread"""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    def _write_loop(self):
+        conn = self._connect()
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            # Linger briefly so bursts of records share one transaction
+            deadline = time.monotonic() + self.linger
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+
+            records = [item for item in batch if item is not _STOP]
+            stopping = len(records) != len(batch)
+            try:
+                if records:
+                    conn = self._write_with_retries(conn, records)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+    def _write_with_retries(self, conn: sqlite3.Connection, records) -> sqlite3.Connection:
+        """Write one batch, retrying on errors; returns the connection to keep using"""
+        for attempt in range(WRITE_ATTEMPTS):
+            try:
+                self._write_batch(conn, records)
+                return conn
+            except Exception:
+                if attempt + 1 == WRITE_ATTEMPTS:
+                    logger.exception("dropping %d play records after %d failed writes", len(records), WRITE_ATTEMPTS)
+                    return conn
+                logger.warning("writing %d play records failed; retrying", len(records), exc_info=True)
+                time.sleep(RETRY_DELAY * 2 ** attempt)
+                try:
+                    conn.close()
+                    conn = self._connect()
+                except sqlite3.Error:
+                    logger.exception("could not reopen the stats database")
+        return conn
+
+    @staticmethod
+    def _write_batch(conn: sqlite3.Connection, records: List[Tuple[str, str, int, int]]):
+        totals = {}
+        for player, game, score, timestamp_ms in records:
+            row = totals.get((player, game))
+            if row is None:
+                totals[(player, game)] = [player, game, 1, score, score, score, timestamp_ms]
+            else:
+                row[2] += 1
+                row[3] += score
+                row[4] = min(row[4], score)
+                row[5] = max(row[5], score)
+        with conn:
+            conn.executemany(
+                "INSERT INTO plays (player, game, score, timestamp_ms) VALUES (?, ?, ?, ?)", records
+            )
+            conn.executemany(UPSERT_TOTALS, totals.values())
+
+    # ---- reads ------------------------------------------------------------
+
+    def game_totals(self, player: str) -> Dict[str, GameTotals]:
+        """Per-game totals for a player, in first-played order"""
+        rows = self._reader().execute(
+            "SELECT game, plays, total_score, min_score, max_score FROM game_totals "
+            "WHERE player = ? ORDER BY first_played_ms, game",
+            (player,)
+        ).fetchall()
+        return {game: GameTotals(*values) for game, *values in rows}
+
+    def favorite_game(self, player: str):
+        """Most played game; ties go to the game played first"""
+        row = self._reader().execute(
+            "SELECT game FROM game_totals WHERE player = ? "
+            "ORDER BY plays DESC, first_played_ms LIMIT 1",
+            (player,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def score_series(self, player: str, max_points: int = 1000) -> List[Tuple[int, int, int]]:
+        """Return ``(bucket_start_ms, plays, score)`` rows in time order.
+
+        The bucket width is chosen so that at most ``max_points`` buckets
+        cover the player's whole history.
+        """
+        conn = self._reader()
+        first, last = conn.execute(
+            "SELECT MIN(timestamp_ms), MAX(timestamp_ms) FROM plays WHERE player = ?", (player,)
+        ).fetchone()
+        if first is None:
+            return []
+        width = max((last - first) // max_points + 1, 1)
+        return conn.execute(
+            "SELECT ? + (timestamp_ms - ?) / ? * ? AS bucket, COUNT(*), SUM(score) FROM plays "
+            "WHERE player = ? GROUP BY bucket ORDER BY bucket",
+            (first, first, width, width, player)
+        ).fetchall()
+
+    def score_counts(self, player: str) -> Dict[str, List[Tuple[int, int]]]:
+        """``{game: [(score, plays), ...]}`` with scores ascending"""
+        counts = {}
+        for game, score, plays in self._reader().execute(
+            "SELECT game, score, COUNT(*) FROM plays WHERE player = ? "
+            "GROUP BY game, score ORDER BY game, score",
+            (player,)
+        ):
+            counts.setdefault(game, []).append((score, plays))
+        return counts
+
+    def recent(self, player: str, limit: int = 10) -> List[Tuple[str, int, int]]:
+        """Latest ``(game, score, timestamp_ms)`` rows, newest first"""
+        return self._reader().execute(
+            "SELECT game, score, timestamp_ms FROM plays WHERE player = ? "
+            "ORDER BY timestamp_ms DESC, id DESC LIMIT ?",
+            (player, limit)
+        ).fetchall()
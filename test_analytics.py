@@ -0,0 +1,86 @@
+import base64
+import numpy as np
+import pytest
+import streamlit as st
+import io
+import history_io
+from analytics import build_analytics_figures, cached_analytics_figures, cached_file_figures, lttb
+from history import PlayHistory
+from main import StreamlitMiniGames
+
+@pytest.fixture(autouse=True)
+def clear_session_state():
+    try:
+        st.session_state.clear()
+    except Exception:
+        pass
+    yield
+    try:
+        st.session_state.clear()
+    except Exception:
+        pass
+
+def _values(spec):
+    # Plotly encodes NumPy arrays as base64 typed arrays in figure dicts
+    if isinstance(spec, dict):
+        return list(np.frombuffer(base64.b64decode(spec['bdata']), dtype=spec['dtype']))
+    return list(spec)
+
+def _history():
+    history = PlayHistory()
+    for i, game in enumerate(['Quiz Game', 'Tic-Tac-Toe', 'Quiz Game']):
+        history.append(game, 10 * (i + 1), timestamp_ms=1_700_000_000_000 + i * 1000)
+    return history
+
+def test_build_analytics_figures():
+    figures = build_analytics_figures(_history())
+    pie = figures['pie']['data'][0]
+    assert list(pie['labels']) == ['Quiz Game', 'Tic-Tac-Toe']
+    assert _values(pie['values']) == [2, 1]
+    assert _values(figures['line']['data'][0]['y']) == [10, 30, 60]
+    assert list(figures['recent']['score']) == [30, 20, 10]
+    p50, p95 = figures['quantiles']['data']
+    assert list(p50['x']) == ['Quiz Game', 'Tic-Tac-Toe']
+    assert _values(p50['y']) == [10, 20] and _values(p95['y']) == [30, 20]
+    assert _values(figures['activity']['data'][0]['y']) == [3]
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(10_000)
+    y = np.zeros(10_000)
+    y[4_321] = 100
+    small_x, small_y = lttb(x, y, 100)
+    assert len(small_x) == 100
+    assert small_x[0] == 0 and small_x[-1] == 9_999
+    assert 4_321 in small_x and list(np.diff(small_x) > 0) == [True] * 99
+    assert len(lttb(x[:50], y[:50], 100)[0]) == 50
+
+def test_long_line_is_downsampled():
+    history = PlayHistory()
+    for i in range(2_000):
+        history.append('Quiz Game', 1, timestamp_ms=1_700_000_000_000 + i * 1000)
+    line = build_analytics_figures(history)['line']['data'][0]
+    assert len(_values(line['y'])) <= 500
+    assert _values(line['y'])[-1] == 2_000
+
+def test_update_stats_bumps_version():
+    app = StreamlitMiniGames()
+    assert st.session_state.game_stats['version'] == 0
+    app.update_stats('Quiz Game', 10)
+    assert st.session_state.game_stats['version'] == 1
+
+def test_cached_figures_reused_until_version_changes():
+    history = _history()
+    first = cached_analytics_figures('session-a', 1, history)
+    history.append('Word Scramble', 5)
+    assert cached_analytics_figures('session-a', 1, history) is not None
+    assert _values(first['line']['data'][0]['y']) == [10, 30, 60]
+    assert len(cached_analytics_figures('session-a', 1, history)['recent']) == 3
+    assert len(cached_analytics_figures('session-a', 2, history)['recent']) == 4
+    cached_analytics_figures.clear()
+
+def test_exported_file_gives_the_same_figures():
+    data = history_io.export_bytes(_history())
+    figures = cached_file_figures('upload-1', 100, io.BytesIO(data))
+    assert _values(figures['line']['data'][0]['y']) == [10, 30, 60]
+    assert list(figures['recent']['score']) == [30, 20, 10]
+    cached_file_figures.clear()
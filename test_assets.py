@@ -0,0 +1,38 @@
+import assets
+
+def test_minify_keeps_strings_and_selectors():
+    source = """
+    /* comment */
+    div :hover , a > b {
+        color : red ;
+        content: "a  /* not a comment */ ;}" ;
+    }
+    """
+    assert assets.minify_css(source) == 'div :hover,a>b{color :red;content:"a  /* not a comment */ ;}"}'
+
+def test_theme_is_minified_and_hashed():
+    theme = assets.load_theme()
+    assert assets.load_theme() is theme
+    source = assets.THEME_FILE.read_text()
+    assert len(theme.css) < len(source)
+    assert 'googleapis' not in theme.css and '@import' not in theme.css
+    assert "font-family:'Poppins'" in theme.css
+    assert '.winner-animation{' in theme.css
+    assert len(theme.digest) == 12 and theme.style_id.endswith(theme.digest)
+
+def test_injector_escapes_the_stylesheet():
+    theme = assets.Theme('a::after{content:"</script>"}', 'abc123')
+    html = assets.injector_html(theme)
+    assert html.count('</script>') == 1
+    assert 'minigames-theme-abc123' in html
+    assert assets.FONTS_URL in html
+
+def test_theme_is_sent_on_the_first_run_only():
+    from pathlib import Path
+    from streamlit.testing.v1 import AppTest
+    app = AppTest.from_file(str(Path(assets.__file__).parent / "main.py"), default_timeout=60)
+    app.run()
+    assert [element.type for element in app.main].count('iframe') == 1
+    assert app.session_state['theme_digest'] == assets.load_theme().digest
+    app.run()
+    assert [element.type for element in app.main].count('iframe') == 0
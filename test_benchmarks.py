@@ -0,0 +1,16 @@
+import json
+from pathlib import Path
+import benchmarks
+
+def test_compare_flags_only_slowdowns_beyond_threshold():
+    baseline = {'a': {'seconds': 1.0}, 'b': {'seconds': 1.0}, 'c': {'seconds': 1.0}}
+    results = {'a': {'seconds': 1.2}, 'b': {'seconds': 1.5}, 'c': {'seconds': 0.5}, 'new': {'seconds': 9.0}}
+    report = benchmarks.compare(results, baseline, threshold=0.25)
+    assert {name: regressed for name, (_, regressed) in report.items()} == {'a': False, 'b': True, 'c': False}
+
+def test_selected_benchmarks_run_and_match_the_baseline_format():
+    results = benchmarks.run(['check_ttt_winner', 'scramble_word[short]'], repeat=2)
+    assert set(results) == {'check_ttt_winner', 'scramble_word[short]'}
+    assert all(result['seconds'] > 0 and result['number'] >= 1 for result in results.values())
+    baseline = json.loads((Path(benchmarks.__file__).parent / 'bench_baseline.json').read_text())
+    assert set(baseline['results']) == set(benchmarks.BENCHMARKS) | {'import_main'}
@@ -0,0 +1,20 @@
+import content
+
+def test_quiz_bank_is_loaded_once_and_indexed():
+    bank = content.load_quiz_bank()
+    assert content.load_quiz_bank() is bank
+    assert 'Programming 💻' in bank.categories
+    for category, questions in bank.by_category.items():
+        assert all(q.category == category for q in questions)
+    assert sum(len(qs) for qs in bank.by_difficulty.values()) == len(bank.questions)
+    q = bank.by_category['General Knowledge 🌍'][0]
+    assert q.options[q.answer] == 'Paris'
+
+def test_tables_are_immutable():
+    bank = content.load_quiz_bank()
+    try:
+        bank.by_category['Programming 💻'] = ()
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("quiz bank mapping should be read-only")
@@ -0,0 +1,71 @@
+import random
+import pytest
+import engine
+from content import Question
+
+QUESTIONS = [
+    Question("Maths", "easy", "2+2=?", ("3", "4", "5"), 1, "2+2=4"),
+    Question("Maths", "easy", "3+3=?", ("6", "7"), 0, "3+3=6"),
+]
+
+def test_number_guess_step_hints_and_score():
+    state = engine.NumberGuessState(secret_number=40)
+    assert engine.number_guess_step(state, 20) == ('low', None)
+    assert engine.number_guess_step(state, 60) == ('high', None)
+    assert engine.number_guess_step(state, 40) == ('correct', 80)
+    assert state.won and state.game_over
+    assert [outcome for _, _, outcome in state.hints] == ['low', 'high']
+
+def test_number_guess_runs_out_of_attempts():
+    state = engine.NumberGuessState(secret_number=40, max_attempts=2)
+    engine.number_guess_step(state, 1)
+    assert engine.number_guess_step(state, 2) == ('lost', 0)
+    with pytest.raises(ValueError):
+        engine.number_guess_step(state, 40)
+
+def test_rps_step_tallies_and_scores():
+    state = engine.RPSState()
+    assert engine.rps_step(state, "rock", "scissors").score == 10
+    assert engine.rps_step(state, "rock", "rock").score == 5
+    assert engine.rps_step(state, "rock", "paper").score == 0
+    assert (state.player_wins, state.draws, state.computer_wins) == (1, 1, 1)
+    assert len(state.game_history) == 3
+
+def test_scramble_rounds_with_fixed_clock():
+    rng = random.Random(7)
+    state = engine.ScrambleState(difficulty='Easy', total_rounds=2)
+    engine.scramble_start(state, ["python"], rng=rng, now=100.0)
+    assert sorted(state.scrambled_word) == sorted("python")
+    first = engine.scramble_step(state, "PYTHON", ["python"], rng=rng, now=103.0)
+    assert first == (True, 17, "python", False)
+    last = engine.scramble_step(state, "typhon", ["python"], rng=rng, now=110.0)
+    assert last == (False, 0, "python", True)
+    assert state.score == 17 and not state.game_active
+
+def test_quiz_step_until_complete():
+    state = engine.QuizState(category='Maths')
+    engine.quiz_start(state, 'Maths', QUESTIONS[::-1])
+    assert engine.quiz_step(state, 0).is_correct
+    result = engine.quiz_step(state, 0)
+    assert not result.is_correct and result.finished
+    assert state.quiz_complete and state.score == 10
+
+def test_ttt_step_win_and_reset():
+    state = engine.TicTacToeState()
+    for position in [0, 3, 1, 4]:
+        assert engine.ttt_step(state, position) == (None, None)
+    assert engine.ttt_step(state, 2) == ('X', 10)
+    assert state.x_wins == 1 and state.game_over
+    engine.ttt_reset(state)
+    assert state.board == [' '] * 9 and state.x_wins == 1
+
+def test_ttt_step_rejects_taken_cell():
+    state = engine.TicTacToeState()
+    engine.ttt_step(state, 4)
+    with pytest.raises(ValueError):
+        engine.ttt_step(state, 4)
+
+def test_quiz_start_draws_a_sample():
+    state = engine.QuizState(category='Maths')
+    engine.quiz_start(state, 'Maths', QUESTIONS * 4, length=3, rng=random.Random(1))
+    assert len(state.questions) == 3
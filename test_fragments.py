@@ -0,0 +1,66 @@
+from pathlib import Path
+import pytest
+from streamlit.testing.v1 import AppTest
+import engine
+import metrics
+
+MAIN = str(Path(__file__).parent / "main.py")
+
+@pytest.fixture
+def script_runs(monkeypatch):
+    """Number of full script runs since the fixture was created"""
+    monkeypatch.setattr(metrics.REGISTRY, 'enabled', True)
+    metrics.REGISTRY.reset()
+
+    def count():
+        histograms, _ = metrics.REGISTRY.snapshot()
+        return sum(h['count'] for h in histograms if h['metric'] == 'rerun_seconds')
+    yield count
+    metrics.REGISTRY.reset()
+
+def _open(page):
+    app = AppTest.from_file(MAIN, default_timeout=60)
+    app.run()
+    app.sidebar.radio[0].set_value(page).run()
+    assert not app.exception
+    return app
+
+def test_wrong_guess_needs_no_extra_rerun(script_runs):
+    # AppTest always runs the whole script, so this checks that a wrong
+    # guess does not call st.rerun(), not how the browser scopes the run
+    app = _open("🎯 Number Guessing")
+    app.session_state['number_game'] = engine.NumberGuessState(secret_number=80)
+    app.run()
+    before = script_runs()
+    app.button(key="submit_guess").click().run()
+    assert script_runs() - before == 1
+    assert [info.value for info in app.info] == ["Too low! Try a higher number."]
+    assert app.session_state['game_stats']['games_played'] == 0
+
+def test_battle_refreshes_the_header_only_when_it_falls_behind(script_runs):
+    app = _open("✂️ Rock Paper Scissors")
+    runs = []
+    for _ in range(3):
+        before = script_runs()
+        app.button(key="rps_battle").click().run()
+        assert not app.exception
+        assert any('VS Computer' in markdown.value for markdown in app.markdown)
+        runs.append(script_runs() - before)
+    # The first battle changes the favorite game, so it asks for a full
+    # rerun. AppTest runs the whole script on every click, which redraws
+    # the header, so later battles never fall RPS_HEADER_REFRESH behind
+    assert runs == [2, 1, 1]
+    stats = app.session_state['game_stats']
+    assert stats['games_played'] == 3
+    # The fragment's own scoreboard counts the latest battle
+    game = app.session_state['rps_game']
+    assert [metric.value for metric in app.metric][-3:] == [
+        str(game.player_wins), str(game.computer_wins), str(game.draws)
+    ]
+
+def test_non_final_move_records_nothing():
+    app = _open("❌⭕ Tic-Tac-Toe")
+    app.button(key="cell_4").click().run()
+    assert not app.exception
+    assert app.session_state['ttt_game'].board[4] == 'X'
+    assert app.session_state['game_stats']['games_played'] == 0
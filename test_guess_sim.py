@@ -0,0 +1,42 @@
+import engine
+import guess_sim
+from guess_sim import GuessConfig
+
+def play_with_engine(secret, config):
+    state = engine.NumberGuessState(secret, config.low, config.high, config.max_attempts)
+    lo, hi = config.low, config.high
+    while True:
+        guess = (lo + hi) // 2
+        outcome, score = engine.number_guess_step(state, guess)
+        if score is not None:
+            return score, state.attempts
+        lo, hi = (guess + 1, hi) if outcome == 'low' else (lo, guess - 1)
+
+def test_binary_search_matches_the_engine_for_every_secret():
+    config = GuessConfig()
+    scores = [play_with_engine(secret, config)[0] for secret in range(1, 101)]
+    report = guess_sim.evaluate(config)
+    assert report.expected_score == sum(scores) / 100
+    assert report.loss_rate == 0.0
+    assert report.attempt_distribution.sum() == 1.0
+
+def test_too_few_attempts_lose_some_games():
+    report = guess_sim.evaluate(GuessConfig(max_attempts=3))
+    # Three halvings can find at most 1 + 2 + 4 secrets
+    assert round(report.loss_rate, 2) == 0.93
+    assert report.attempt_distribution.tolist() == [0.01, 0.02, 0.04]
+
+def test_sweep_reports_each_configuration():
+    configs = [GuessConfig(1, high, attempts) for high in (10, 50, 100) for attempts in (3, 5, 7)]
+    reports = guess_sim.evaluate_many(configs, "human", trials=20, seed=4)
+    assert [report.config for report in reports] == configs
+    for report in reports:
+        assert 0 <= report.loss_rate <= 1
+        assert abs(report.attempt_distribution.sum() - (1 - report.loss_rate)) < 1e-9
+
+def test_random_strategies_are_seedable_and_worse_than_binary():
+    binary = guess_sim.evaluate(strategy="binary")
+    first = guess_sim.evaluate(strategy="random", trials=50, seed=1)
+    again = guess_sim.evaluate(strategy="random", trials=50, seed=1)
+    assert (first.expected_score, first.loss_rate) == (again.expected_score, again.loss_rate)
+    assert first.expected_score < binary.expected_score
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from history import PlayHistory, ScoreSketch
+
+def test_append_and_index_records():
+    history = PlayHistory(capacity=1)
+    history.append('Quiz Game', 20, timestamp_ms=1_000)
+    history.append('Tic-Tac-Toe', 10, timestamp_ms=2_000)
+    history.append('Quiz Game', 30, timestamp_ms=3_000)
+    assert len(history) == 3
+    assert history[-1]['game'] == 'Quiz Game'
+    assert history[1]['score'] == 10
+    assert history.game_names == ('Quiz Game', 'Tic-Tac-Toe')
+    with pytest.raises(IndexError):
+        history[3]
+
+def test_columns_are_views_that_survive_growth():
+    history = PlayHistory(capacity=2)
+    history.append('Quiz Game', 20, timestamp_ms=1_000)
+    codes, scores, timestamps = history.columns()
+    for i in range(10):
+        history.append('Word Scramble', i, timestamp_ms=2_000 + i)
+    assert list(scores) == [20]
+    assert scores.dtype == np.int32 and timestamps.dtype == np.int64
+    assert len(history.columns()[1]) == 11
+
+def test_to_frame_uses_typed_columns():
+    history = PlayHistory()
+    history.append('Quiz Game', 20, timestamp_ms=1_700_000_000_000)
+    history.append('Tic-Tac-Toe', 5, timestamp_ms=1_700_000_060_000)
+    df = history.to_frame()
+    assert list(df['game']) == ['Quiz Game', 'Tic-Tac-Toe']
+    assert df['score'].sum() == 25
+    assert str(df['timestamp'].dtype) == 'datetime64[ms]'
+    assert df['timestamp'].iloc[1] - df['timestamp'].iloc[0] == np.timedelta64(60, 's')
+
+def test_bounded_history_rolls_up_evicted_records():
+    history = PlayHistory(capacity=2, max_records=5)
+    games = ['Quiz Game', 'Tic-Tac-Toe']
+    for i in range(23):
+        history.append(games[i % 2], i, timestamp_ms=i * 30_000)
+    assert len(history) == 5
+    assert history.total_records == 23
+    assert [history[i]['score'] for i in range(5)] == [18, 19, 20, 21, 22]
+    assert list(history.columns()[1]) == [18, 19, 20, 21, 22]
+    assert history.rollups.count == 18
+    assert list(history.game_counts()) == [12, 11]
+    timestamps, cumulative = history.cumulative_series()
+    assert cumulative[-1] == sum(range(23))
+    assert list(np.diff(timestamps) >= 0) == [True] * (len(timestamps) - 1)
+
+def test_rollups_fold_into_coarser_levels():
+    history = PlayHistory(max_records=1)
+    history.rollups.max_minutes = 2
+    history.rollups.max_hours = 1
+    for minute in range(0, 60 * 5, 30):  # every 30 minutes for five hours
+        history.append('Quiz Game', 10, timestamp_ms=minute * 60_000)
+    rollups = history.rollups
+    assert len(rollups.minutes) <= 2 and len(rollups.hours) <= 1
+    assert sum(b.count for b in rollups.buckets()) == rollups.count == 9
+    assert history.cumulative_series()[1][-1] == 100
+
+def test_score_sketch_is_exact_for_few_distinct_scores_and_mergeable():
+    left, right = ScoreSketch(), ScoreSketch()
+    for score in range(0, 50, 2):
+        left.add(score)
+    for score in range(50, 100, 2):
+        right.add(score)
+    left.merge(right)
+    assert left.count == 50
+    assert left.quantile(0.5) == 48 and left.quantile(0.95) == 94
+    assert ScoreSketch().quantile(0.5) is None
+
+def test_score_sketch_stays_bounded_and_close():
+    sketch = ScoreSketch(max_bins=32)
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 10_000, 5_000)
+    for score in scores:
+        sketch.add(int(score))
+    assert len(sketch.values) <= 32
+    assert abs(sketch.quantile(0.5) - np.median(scores)) < 500
+
+def test_sketches_survive_eviction():
+    history = PlayHistory(max_records=2)
+    for i in range(10):
+        history.append('Quiz Game', i * 10, timestamp_ms=i * 60 * 60_000 // 2)
+    assert history.score_quantiles() == {'Quiz Game': (40, 90)}
+    hours, plays = history.hourly_series()
+    assert list(plays) == [2] * 5 and hours[1] - hours[0] == 60 * 60_000
+    assert list(history.to_frame(last=1)['score']) == [90]
+
+def test_extend_matches_append():
+    appended, extended = PlayHistory(max_records=6), PlayHistory(max_records=6)
+    codes = [extended.encode_game(name) for name in ('Quiz Game', 'Tic-Tac-Toe')]
+    for start in (0, 4, 9):
+        batch = range(start, start + (4 if start < 9 else 7))
+        for i in batch:
+            appended.append(('Quiz Game', 'Tic-Tac-Toe')[i % 2], i, timestamp_ms=i * 40_000)
+        extended.extend([codes[i % 2] for i in batch], list(batch), [i * 40_000 for i in batch])
+    for ours, theirs in zip(appended.columns(), extended.columns()):
+        assert list(ours) == list(theirs)
+    assert extended.rollups.count == appended.rollups.count == 9
+    assert list(extended.game_counts()) == list(appended.game_counts())
+    assert extended.score_quantiles() == appended.score_quantiles()
@@ -0,0 +1,77 @@
+import io
+import numpy as np
+import pytest
+import pyarrow as pa
+import pyarrow.parquet as pq
+import history_io
+from history import PlayHistory
+
+def _history(n=1_000):
+    history = PlayHistory()
+    for i in range(n):
+        history.append(['Quiz Game', 'Tic-Tac-Toe', 'Word Scramble'][i % 3], i % 50,
+                       timestamp_ms=1_700_000_000_000 + i * 1000)
+    return history
+
+@pytest.mark.parametrize('suffix', ['.parquet', '.arrow'])
+def test_round_trip_through_files(tmp_path, suffix):
+    history = _history()
+    path = tmp_path / f'history{suffix}'
+    history_io.export_history(history, path, chunk_size=128)
+    loaded = history_io.import_history(path, chunk_size=100)
+    assert loaded.game_names == history.game_names
+    for ours, theirs in zip(history.columns(), loaded.columns()):
+        assert np.array_equal(ours, theirs)
+    assert loaded.score_quantiles() == history.score_quantiles()
+
+def test_export_is_chunked():
+    data = history_io.export_bytes(_history(), 'parquet', chunk_size=300)
+    assert pq.ParquetFile(io.BytesIO(data)).num_row_groups == 4
+    batches = list(history_io.read_batches(io.BytesIO(history_io.export_bytes(_history(), 'arrow', 300))))
+    assert [batch.num_rows for batch in batches] == [300, 300, 300, 100]
+
+def test_import_into_bounded_history_rolls_up():
+    data = io.BytesIO(history_io.export_bytes(_history(), 'arrow', chunk_size=64))
+    loaded = history_io.import_history(data, max_records=10)
+    assert len(loaded) == 10 and loaded.total_records == 1_000
+    assert loaded[-1]['score'] == 999 % 50
+    assert loaded.cumulative_series()[1][-1] == sum(i % 50 for i in range(1_000))
+
+def test_import_accepts_plain_columns(tmp_path):
+    path = tmp_path / 'plain.parquet'
+    pq.write_table(pa.table({'game': ['Quiz Game', 'Tic-Tac-Toe'], 'score': [3, 4], 'timestamp': [1_000, 2_000]}), path)
+    loaded = history_io.import_history(path)
+    assert [record['game'] for record in loaded] == ['Quiz Game', 'Tic-Tac-Toe']
+    assert list(loaded.columns()[2]) == [1_000, 2_000]
+
+def test_rejects_other_files():
+    with pytest.raises(ValueError):
+        history_io.import_history(io.BytesIO(b'game,score\n'))
+    with pytest.raises(ValueError):
+        history_io.export_bytes(_history(1), 'csv')
+
+def test_missing_columns_are_rejected(tmp_path):
+    path = tmp_path / 'no_timestamp.parquet'
+    pq.write_table(pa.table({'game': ['Quiz Game'], 'score': [3]}), path)
+    with pytest.raises(ValueError, match='timestamp'):
+        history_io.import_history(path)
+    sink = io.BytesIO()
+    with pa.ipc.new_file(sink, pa.schema([('game', pa.string())])) as writer:
+        writer.write_batch(pa.record_batch([pa.array(['Quiz Game'])], names=['game']))
+    with pytest.raises(ValueError, match='score, timestamp'):
+        history_io.import_history(io.BytesIO(sink.getvalue()))
+
+@pytest.mark.parametrize('column', ['game', 'score', 'timestamp'])
+def test_null_values_are_rejected(tmp_path, column):
+    values = {'game': ['Quiz Game', 'Tic-Tac-Toe'], 'score': [3, 4], 'timestamp': [1_000, 2_000]}
+    values[column] = [values[column][0], None]
+    path = tmp_path / 'nulls.parquet'
+    pq.write_table(pa.table(values), path)
+    with pytest.raises(ValueError, match=column):
+        history_io.import_history(path)
+
+def test_wrong_column_types_are_rejected(tmp_path):
+    path = tmp_path / 'types.parquet'
+    pq.write_table(pa.table({'game': [1], 'score': ['high'], 'timestamp': [1_000]}), path)
+    with pytest.raises(ValueError, match='game, score'):
+        history_io.import_history(path)
@@ -0,0 +1,34 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Budget for `import main` on top of an already-imported streamlit
+IMPORT_BUDGET_SECONDS = 0.5
+
+PROBE = """
+import json, sys, time
+import streamlit
+start = time.perf_counter()
+from main import StreamlitMiniGames
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'elapsed': elapsed,
+    'heavy': [name for name in ('pandas', 'plotly.express', 'pyarrow') if name in sys.modules],
+}))
+"""
+
+def _probe():
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_import_main_defers_heavy_dependencies():
+    assert _probe()['heavy'] == []
+
+def test_import_main_within_budget():
+    # Best of three to keep a cold disk cache from failing the run
+    elapsed = min(_probe()['elapsed'] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,83 @@
+import random
+import threading
+import pytest
+from leaderboard import Leaderboard, OrderStatisticTree
+
+def test_order_statistic_tree_matches_a_sorted_list():
+    rng = random.Random(11)
+    tree, reference = OrderStatisticTree(rng), []
+    for _ in range(3000):
+        if reference and rng.random() < 0.4:
+            key = rng.choice(reference)
+            reference.remove(key)
+            tree.remove(key)
+        else:
+            key = rng.randrange(50)
+            reference.append(key)
+            tree.add(key)
+        probe = rng.randrange(-1, 51)
+        assert tree.count_above(probe) == sum(1 for k in reference if k > probe)
+    assert len(tree) == len(reference)
+    with pytest.raises(KeyError):
+        tree.remove(999)
+
+def test_rank_percent_and_top_k_across_stripes():
+    board = Leaderboard(stripes=4, top_k=3)
+    for index in range(10):
+        board.submit(f"p{index}", "Quiz Game", index * 10)
+    assert board.rank("p9", "Quiz Game") == (1, 10)
+    assert board.top_percent("p0", "Quiz Game") == 100.0
+    assert board.top("Quiz Game") == [("p9", 90), ("p8", 80), ("p7", 70)]
+    # Totals only grow; a player can climb back into the top K
+    board.submit("p0", "Quiz Game", 500)
+    assert board.rank("p0", "Quiz Game") == (1, 10)
+    assert board.top("Quiz Game", 2) == [("p0", 500), ("p9", 90)]
+    assert board.rank("nobody", "Quiz Game") is None
+    assert board.top("Tic-Tac-Toe") == []
+
+def test_concurrent_submissions_keep_counts_consistent():
+    board = Leaderboard(stripes=8)
+
+    def play(worker):
+        for round_number in range(1, 201):
+            board.submit(f"w{worker}-{round_number % 20}", "Word Scramble", round_number)
+
+    threads = [threading.Thread(target=play, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert board.rank("w0-0", "Word Scramble")[1] == 160
+    assert board.total("w3-0", "Word Scramble") == 200
+
+def test_idle_players_expire_and_removal_refills_top_k():
+    now = [0.0]
+    board = Leaderboard(stripes=1, top_k=2, idle_ttl=10, clock=lambda: now[0])
+    for index in range(4):
+        board.submit(f"p{index}", "Quiz Game", index * 10)
+    board.remove("p3")
+    assert board.top("Quiz Game") == [("p2", 20), ("p1", 10)]
+    assert board.rank("p0", "Quiz Game") == (3, 3)
+    now[0] = 5.0
+    board.submit("p1", "Quiz Game", 15)
+    now[0] = 12.0
+    # p0 was seen by its rank query at t=0 and p2 never since; both expire
+    assert board.rank("p1", "Quiz Game") == (1, 1)
+    assert board.total("p2", "Quiz Game") is None
+    assert board.top("Quiz Game") == [("p1", 15)]
+
+def test_returning_player_gets_every_game_back():
+    now = [0.0]
+    board = Leaderboard(stripes=2, top_k=3, idle_ttl=10, clock=lambda: now[0])
+    sums = {"Quiz Game": 40, "Number Guessing": 25}
+    board.submit_all("me", sums)
+    board.submit("other", "Number Guessing", 30)
+    now[0] = 20.0
+    assert board.top("Number Guessing") == []
+    sums["Quiz Game"] = 50
+    board.submit("me", "Quiz Game", 50, restore=sums)
+    assert board.total("me", "Number Guessing") == 25
+    assert board.rank("me", "Number Guessing") == (1, 1)
+    # Only restored when absent: an active player's other totals are untouched
+    board.submit("me", "Quiz Game", 60, restore={"Quiz Game": 60, "Number Guessing": 0})
+    assert board.total("me", "Number Guessing") == 25
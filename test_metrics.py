@@ -0,0 +1,64 @@
+from pathlib import Path
+import pytest
+import metrics
+
+def test_disabled_registry_records_nothing():
+    registry = metrics.MetricsRegistry(enabled=False)
+    calls = registry.timed("work")(lambda x: x * 2)
+    assert calls(21) == 42
+    with registry.timer("block"):
+        pass
+    registry.inc("events")
+    assert registry.snapshot() == ([], [])
+    assert registry.to_prometheus() == ""
+
+def test_timed_records_calls_that_raise():
+    registry = metrics.MetricsRegistry(enabled=True)
+
+    @registry.timed("page_seconds", page="quiz")
+    def page(fail):
+        if fail:
+            raise RuntimeError("rerun")
+
+    page(False)
+    with pytest.raises(RuntimeError):
+        page(True)
+    histograms, _ = registry.snapshot()
+    assert [(row['metric'], row['labels'], row['count']) for row in histograms] == \
+        [('page_seconds', {'page': 'quiz'}, 2)]
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    histogram = metrics.Histogram((1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0):
+        histogram.observe(value)
+    assert histogram.quantile(0.5) == 1.5
+    assert histogram.quantile(1.0) == 4.0
+
+def test_prometheus_text_and_throttled_dump(tmp_path):
+    registry = metrics.MetricsRegistry(enabled=True, buckets=(0.01, 0.1))
+    registry.observe("rerun_seconds", 0.05)
+    registry.inc("games_recorded_total", game='Quiz "Game"')
+    text = registry.to_prometheus()
+    assert '# TYPE minigames_rerun_seconds histogram' in text
+    assert 'minigames_rerun_seconds_bucket{le="0.1"} 1' in text
+    assert 'minigames_rerun_seconds_bucket{le="+Inf"} 1' in text
+    assert 'minigames_games_recorded_total{game="Quiz \\"Game\\""} 1' in text
+
+    path = tmp_path / "metrics.prom"
+    assert registry.maybe_dump(path, interval=60)
+    assert path.read_text() == text
+    assert not registry.maybe_dump(path, interval=60)
+
+def test_admin_token_check_handles_non_ascii(monkeypatch):
+    from streamlit.testing.v1 import AppTest
+    main_py = str(Path(metrics.__file__).parent / 'main.py')
+    monkeypatch.setenv('MINIGAMES_ADMIN_TOKEN', 'sécret')
+    app = AppTest.from_file(main_py, default_timeout=30)
+    app.query_params['admin'] = 'é'
+    app.run()
+    assert not app.exception
+    assert not any('Metrics' in option for option in app.sidebar.radio[0].options)
+    app = AppTest.from_file(main_py, default_timeout=30)
+    app.query_params['admin'] = 'sécret'
+    app.run()
+    assert any('Metrics' in option for option in app.sidebar.radio[0].options)
@@ -0,0 +1,14 @@
+import rerun_bench
+
+def test_reports_percentiles_per_page_and_size():
+    results = rerun_bench.run(sizes=(0, 200), reruns=3, pages=['Home', 'Analytics'])
+    assert list(results) == [0, 200]
+    for pages in results.values():
+        assert len(pages) == 2
+        for summary in pages.values():
+            assert summary['p50'] <= summary['p95'] <= summary['p99']
+
+def test_seeded_stats_come_from_update_stats():
+    stats = rerun_bench.seeded_stats(300)
+    assert stats['games_played'] == 300 == len(stats['play_history'])
+    assert sum(stats['game_counts'].values()) == 300
@@ -0,0 +1,36 @@
+import random
+import engine
+import rps_ai
+
+def test_model_counts_update_incrementally():
+    model = rps_ai.RPSModel(order=2)
+    assert model.predict() is None
+    for move in ["rock", "paper", "rock", "paper"]:
+        model.observe(move)
+    assert model.frequency == [2, 2, 0]
+    # After rock, paper: rock came next once
+    assert model.transitions[(0, 1)] == [1, 0, 0]
+    assert model.predict() == (1.0, 0.0, 0.0)
+
+def test_context_table_stays_bounded():
+    model = rps_ai.RPSModel(order=3)
+    rng = random.Random(1)
+    for _ in range(5000):
+        model.observe(rng.choice(engine.RPS_CHOICES))
+    assert len(model.transitions) <= 3 + 9 + 27
+    assert model.rounds == 5000
+
+def test_adaptive_opponent_beats_a_cycling_player():
+    rng = random.Random(5)
+    state, model = engine.RPSState(), rps_ai.RPSModel()
+    for round_number in range(300):
+        rps_ai.play_round(state, model, engine.RPS_CHOICES[round_number % 3], rng=rng)
+    assert state.computer_wins > 200
+
+def test_random_opponent_still_trains_the_model():
+    rng = random.Random(5)
+    state, model = engine.RPSState(), rps_ai.RPSModel()
+    for _ in range(30):
+        rps_ai.play_round(state, model, "rock", adaptive=False, rng=rng)
+    assert model.frequency == [30, 0, 0]
+    assert rps_ai.choose_move(model, exploration=0.0, rng=rng) == "paper"
@@ -0,0 +1,27 @@
+import engine
+import rps_sim
+
+def test_payoff_matrix_matches_the_rules():
+    assert engine.determine_rps_winner("rock", "scissors") == "win"
+    assert engine.determine_rps_winner("scissors", "rock") == "lose"
+    assert engine.determine_rps_winner("paper", "paper") == "draw"
+    assert rps_sim.SCORE_MATRIX.tolist() == [[5, 0, 10], [10, 5, 0], [0, 10, 5]]
+
+def test_random_vs_random_is_even():
+    report = rps_sim.simulate(rps_sim.RandomStrategy(), rps_sim.RandomStrategy(), rounds=100, matches=2000, seed=1)
+    assert report.rounds == 200_000
+    assert abs(report.win_rate - 1 / 3) < 0.01 and abs(report.loss_rate - 1 / 3) < 0.01
+    assert sum(report.score_counts.values()) == report.rounds
+    assert abs(report.mean_score - 5) < 0.05
+    assert report.match_totals.shape == (2000,)
+    assert report.match_percentiles[5] <= report.match_percentiles[50] <= report.match_percentiles[95]
+
+def test_adaptive_exploits_predictable_players():
+    for player in (rps_sim.CycleStrategy(), rps_sim.RandomStrategy((1, 0, 0))):
+        report = rps_sim.simulate(player, rps_sim.AdaptiveStrategy(), rounds=60, matches=500, seed=2)
+        assert report.loss_rate > 0.8
+
+def test_simulation_is_seedable():
+    first = rps_sim.simulate(rps_sim.RandomStrategy(), rps_sim.AdaptiveStrategy(), rounds=20, matches=100, seed=9)
+    second = rps_sim.simulate(rps_sim.RandomStrategy(), rps_sim.AdaptiveStrategy(), rounds=20, matches=100, seed=9)
+    assert first.score_counts == second.score_counts
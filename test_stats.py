@@ -0,0 +1,57 @@
+import pytest
+import streamlit as st
+from main import StreamlitMiniGames
+
+@pytest.fixture(autouse=True)
+def clear_session_state():
+    try:
+        st.session_state.clear()
+    except Exception:
+        pass
+    yield
+    try:
+        st.session_state.clear()
+    except Exception:
+        pass
+
+def test_update_stats_tracks_per_game_counters():
+    app = StreamlitMiniGames()
+    app.update_stats('Quiz Game', 20)
+    app.update_stats('Quiz Game', 10)
+    app.update_stats('Tic-Tac-Toe', 5)
+    stats = st.session_state.game_stats
+    assert stats['game_counts'] == {'Quiz Game': 2, 'Tic-Tac-Toe': 1}
+    assert stats['game_score_sums'] == {'Quiz Game': 30, 'Tic-Tac-Toe': 5}
+    assert stats['favorite_game'] == 'Quiz Game'
+
+def test_favorite_game_tie_goes_to_first_played():
+    app = StreamlitMiniGames()
+    # A, B, B, A -> tie at 2, the first played game wins the tie
+    for game in ['Word Scramble', 'Quiz Game', 'Quiz Game']:
+        app.update_stats(game, 10)
+    assert st.session_state.game_stats['favorite_game'] == 'Quiz Game'
+    app.update_stats('Word Scramble', 10)
+    assert st.session_state.game_stats['favorite_game'] == 'Word Scramble'
+
+def test_running_aggregates_for_header():
+    app = StreamlitMiniGames()
+    assert app.average_score() == 0
+    app.update_stats('Rock Paper Scissors', 10)
+    app.update_stats('Rock Paper Scissors', 0)
+    app.update_stats('Quiz Game', 30)
+    stats = st.session_state.game_stats
+    assert (stats['min_score'], stats['max_score']) == (0, 30)
+    assert stats['game_min_scores']['Rock Paper Scissors'] == 0
+    assert stats['game_max_scores']['Rock Paper Scissors'] == 10
+    assert app.average_score() == pytest.approx(40 / 3)
+    assert app.average_score('Rock Paper Scissors') == 5
+    assert app.average_score('Tic-Tac-Toe') == 0
+
+def test_update_stats_feeds_the_shared_leaderboard():
+    from main import get_leaderboard
+    app = StreamlitMiniGames()
+    app.update_stats('Quiz Game', 40)
+    app.update_stats('Quiz Game', 10)
+    stats = st.session_state.game_stats
+    assert get_leaderboard().total(stats['session_id'], 'Quiz Game') == 50
+    assert get_leaderboard().top_percent(stats['session_id'], 'Quiz Game') is not None
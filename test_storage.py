@@ -0,0 +1,79 @@
+import sqlite3
+import pytest
+from storage import SQLiteStatsStore
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteStatsStore(str(tmp_path / 'stats.db'))
+    yield store
+    store.close()
+
+def test_records_are_batched_into_totals(store):
+    for i, (game, score) in enumerate([('Quiz Game', 20), ('Tic-Tac-Toe', 10), ('Quiz Game', 30)]):
+        store.record('p1', game, score, timestamp_ms=1_000 + i)
+    store.record('p2', 'Word Scramble', 50, timestamp_ms=1_000)
+    store.flush()
+    totals = store.game_totals('p1')
+    assert list(totals) == ['Quiz Game', 'Tic-Tac-Toe']
+    assert totals['Quiz Game'] == (2, 50, 20, 30)
+    assert store.favorite_game('p1') == 'Quiz Game'
+    assert store.favorite_game('nobody') is None
+
+def test_favorite_tie_goes_to_first_played(store):
+    store.record('p1', 'Word Scramble', 5, timestamp_ms=1_000)
+    store.record('p1', 'Quiz Game', 5, timestamp_ms=2_000)
+    store.flush()
+    assert store.favorite_game('p1') == 'Word Scramble'
+
+def test_score_series_and_recent(store):
+    for i in range(100):
+        store.record('p1', 'Rock Paper Scissors', 10, timestamp_ms=i * 1_000)
+    store.flush()
+    series = store.score_series('p1', max_points=10)
+    assert len(series) <= 10
+    assert sum(plays for _, plays, _ in series) == 100
+    assert sum(score for _, _, score in series) == 1_000
+    assert [ts for _, _, ts in store.recent('p1', limit=3)] == [99_000, 98_000, 97_000]
+
+def test_score_counts(store):
+    for score in (10, 20, 10):
+        store.record('p1', 'Quiz Game', score)
+    store.record('p1', 'Word Scramble', 5)
+    store.flush()
+    assert store.score_counts('p1') == {'Quiz Game': [(10, 2), (20, 1)], 'Word Scramble': [(5, 1)]}
+
+def test_persists_in_wal_mode(tmp_path):
+    path = str(tmp_path / 'stats.db')
+    first = SQLiteStatsStore(path)
+    first.record('p1', 'Quiz Game', 20)
+    first.close()
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    second = SQLiteStatsStore(path)
+    assert second.game_totals('p1')['Quiz Game'].plays == 1
+    second.close()
+
+def test_failed_batch_does_not_stop_the_writer(store, monkeypatch):
+    import storage
+    monkeypatch.setattr(storage, 'RETRY_DELAY', 0)
+    write_batch = SQLiteStatsStore._write_batch
+    failures = []
+
+    def flaky(conn, records):
+        if not failures:
+            failures.append(records)
+            raise sqlite3.OperationalError("database is locked")
+        write_batch(conn, records)
+
+    monkeypatch.setattr(store, '_write_batch', flaky)
+    store.record('p1', 'Quiz Game', 20)
+    store.flush()
+    store.record('p1', 'Quiz Game', 30)
+    store.flush()
+    assert failures and store._writer.is_alive()
+    assert store.game_totals('p1')['Quiz Game'] == (2, 50, 20, 30)
+
+def test_flush_returns_when_writer_is_gone(tmp_path):
+    store = SQLiteStatsStore(str(tmp_path / 'stats.db'))
+    store.close()
+    store.record('p1', 'Quiz Game', 20)
+    store.flush()
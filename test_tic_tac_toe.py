@@ -66,4 +66,19 @@ def test_update_stats_on_ttt_win():
     assert st.session_state.game_stats['games_played'] == 1
     assert st.session_state.game_stats['total_score'] == 10
     assert st.session_state.game_stats['play_history'][-1]['game'] == 'Tic-Tac-Toe'
-    assert st.session_state.game_stats['favorite_game'] == 'Tic-Tac-Toe'
\ No newline at end of file
+    assert st.session_state.game_stats['favorite_game'] == 'Tic-Tac-Toe'
+
+def test_bitboard_round_trip_and_winner():
+    from engine import bitboard_from_board, board_from_bitboard, bitboard_winner
+    board = ['X', 'O', ' ',
+             ' ', 'X', 'O',
+             ' ', ' ', 'X']
+    x_bits, o_bits = bitboard_from_board(board)
+    assert x_bits == 0b100010001 and o_bits == 0b000100010
+    assert board_from_bitboard(x_bits, o_bits) == board
+    assert bitboard_winner(x_bits, o_bits) == 'X'
+
+def test_legal_moves_from_bitmask():
+    from engine import bitboard_from_board, iter_moves, legal_moves
+    x_bits, o_bits = bitboard_from_board(['X', ' ', 'O', ' ', ' ', ' ', ' ', ' ', 'X'])
+    assert list(iter_moves(legal_moves(x_bits, o_bits))) == [1, 3, 4, 5, 6, 7]
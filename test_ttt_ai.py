@@ -0,0 +1,33 @@
+import random
+import engine
+import ttt_ai
+
+def test_table_covers_every_reachable_position():
+    table = ttt_ai.solved_positions()
+    assert len(table) == 5478
+    assert ttt_ai.solved_positions() is table
+    assert ttt_ai.position_value(0, 0) == 0
+
+def test_best_move_completes_or_blocks_a_line():
+    # O to move with two in a row: take the win at cell 5
+    x_bits, o_bits = engine.bitboard_from_board(['X', 'X', ' ',
+                                                 'O', 'O', ' ',
+                                                 'X', ' ', ' '])
+    assert ttt_ai.best_moves(x_bits, o_bits) == 1 << 5
+    assert ttt_ai.position_value(x_bits, o_bits) == 1
+
+def test_unbeatable_computer_never_loses():
+    rng = random.Random(3)
+    for _ in range(200):
+        state = engine.TicTacToeState(computer_player='O')
+        while not state.game_over:
+            moves = list(engine.iter_moves(engine.legal_moves(state.x_bits, state.o_bits)))
+            engine.ttt_step(state, rng.choice(moves))
+            ttt_ai.computer_turn(state, "🤖 Unbeatable", rng)
+        assert state.winner != 'X'
+
+def test_computer_win_scores_zero():
+    state = engine.TicTacToeState(computer_player='O')
+    for position in [0, 3, 1, 4, 8]:
+        engine.ttt_step(state, position)
+    assert engine.ttt_step(state, 5) == ('O', engine.TTT_LOSS_SCORE)
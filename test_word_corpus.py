@@ -0,0 +1,71 @@
+import random
+import engine
+import word_corpus
+from word_corpus import WordCorpus
+
+def test_anagrams_share_one_signature_group():
+    corpus = WordCorpus(["listen", "silent", "enlist", "google", "Listen", "a"])
+    assert len(corpus) == 4
+    assert corpus.anagrams("TINSLE") == ("enlist", "listen", "silent")
+    assert corpus.anagrams("python") == ()
+    assert "silent" in corpus and "tinsle" not in corpus
+
+def test_any_dictionary_anagram_is_a_valid_answer():
+    corpus = WordCorpus(["listen", "silent", "python"])
+    assert corpus.is_valid_answer(" Silent ", "listen")
+    assert not corpus.is_valid_answer("tinsle", "listen")
+    assert not corpus.is_valid_answer("typhon", "python")
+
+def test_difficulty_pools_by_length_and_frequency():
+    # 10 words, most common first: the last four are in the 'rare' band
+    words = ["cat", "dog", "house", "garden", "tree", "keyboard",
+             "programming", "zebu", "quokka", "encapsulation"]
+    corpus = WordCorpus(words)
+    assert sorted(corpus.words('easy')) == ["cat", "dog", "tree"]
+    assert sorted(corpus.words('medium')) == ["garden", "house", "keyboard"]
+    assert sorted(corpus.words('hard')) == ["encapsulation", "programming"]
+    assert corpus.pool('easy') is corpus.pool('easy')
+
+def test_bundled_corpus_is_shared_and_plays():
+    corpus = word_corpus.load_corpus()
+    assert word_corpus.load_corpus() is corpus
+    assert all(len(corpus.words(level)) for level in word_corpus.DIFFICULTY_RULES)
+
+    rng = random.Random(3)
+    state = engine.ScrambleState(difficulty='Easy', total_rounds=1)
+    words = corpus.words('medium')
+    engine.scramble_start(state, words, rng=rng, now=0.0, corpus=corpus)
+    answer = state.current_word
+    other = next((w for w in corpus.anagrams(answer) if w != answer), answer)
+    result = engine.scramble_step(state, other, words, rng=rng, now=1.0, corpus=corpus)
+    assert result.correct and result.finished
+
+def test_scramble_shown_is_never_an_accepted_answer():
+    corpus = WordCorpus(["eat", "tea", "ate"])
+    words = ["eat", "tea", "ate"]
+    rng = random.Random(0)
+    for _ in range(200):
+        state = engine.ScrambleState(difficulty='Easy', total_rounds=1)
+        engine.scramble_start(state, words, rng=rng, now=0.0, corpus=corpus)
+        assert state.scrambled_word != state.current_word
+        assert state.scrambled_word not in corpus  # "eta", "aet" or "tae"
+        result = engine.scramble_step(state, state.scrambled_word, words, rng=rng, now=1.0, corpus=corpus)
+        assert not result.correct
+
+    # Every arrangement is a word: the on-screen puzzle still does not score
+    corpus = WordCorpus(["ab", "ba"])
+    state = engine.ScrambleState(difficulty='Easy', total_rounds=2)
+    engine.scramble_start(state, ["ab"], rng=rng, now=0.0, corpus=corpus)
+    assert state.scrambled_word == "ba"
+    assert not engine.scramble_step(state, "ba", ["ab"], rng=rng, now=1.0, corpus=corpus).correct
+    assert engine.scramble_step(state, "ab", ["ab"], rng=rng, now=2.0, corpus=corpus).correct
+
+def test_large_corpus_builds_compact_index():
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = {''.join(rng.choices(letters, k=rng.randint(3, 12))) for _ in range(100_000)}
+    corpus = WordCorpus(words)
+    assert len(corpus) == len(words)
+    word = next(iter(words))
+    assert word in corpus.anagrams(word)
+    assert sum(len(corpus.pool(level)) for level in word_corpus.DIFFICULTY_RULES) > 0
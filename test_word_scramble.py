@@ -1,4 +1,6 @@
+import random
 import pytest
+import engine
 from main import StreamlitMiniGames
 
 def test_scramble_word_changes_order():
@@ -7,3 +9,16 @@ def test_scramble_word_changes_order():
     scrambled = app.scramble_word(word)
     assert scrambled != word or len(word) == 1
     assert sorted(scrambled) == sorted(word)
+
+def test_scramble_word_swaps_instead_of_retrying():
+    assert {engine.scramble_word("ab", random.Random(seed)) for seed in range(20)} == {"ba"}
+    assert engine.scramble_word("zzz") == "zzz"
+
+def test_scramble_words_batch_is_seedable_and_always_differs():
+    words = ["python", "ab", "abab", "listen", "zzz", "", "encapsulation"] * 200
+    first = engine.scramble_words(words, seed=42)
+    assert first == engine.scramble_words(words, seed=42)
+    for word, scrambled in zip(words, first):
+        assert sorted(scrambled) == sorted(word)
+        assert scrambled != word or len(set(word)) < 2
+    assert engine.scramble_words([]) == []
@@ -0,0 +1,98 @@
+"""
+Tic-Tac-Toe Computer Opponent
+=============================
+Perfect-play tic-tac-toe backed by a precomputed table of every position
+reachable from the empty board (5,478 of them).
+
+The table is solved once per process on first use and shared by all
+sessions, so picking a move is a dictionary lookup rather than a search per
+click. Lower difficulty levels blend in uniformly random moves.
+"""
+
+import random
+from functools import lru_cache
+
+from engine import TTT_FULL_BOARD, TTT_WINNING, TicTacToeState, iter_moves, legal_moves, ttt_step
+
+# Chance that the computer plays a random legal move instead of a best one
+DIFFICULTY_RANDOMNESS = {
+    "😊 Easy": 0.6,
+    "🤔 Medium": 0.25,
+    "🤖 Unbeatable": 0.0,
+}
+
+
+def _key(x_bits: int, o_bits: int) -> int:
+    return x_bits | o_bits << 9
+
+
+@lru_cache(maxsize=None)
+def solved_positions():
+    """Solve every reachable position; built once per process.
+
+    Returns a dict mapping ``x_bits | o_bits << 9`` to ``(value, best_moves)``
+    where ``value`` is +1/0/-1 for the player to move under perfect play and
+    ``best_moves`` is the bitmask of moves that achieve it (0 once the game
+    is over).
+    """
+    table = {}
+
+    def solve(mover: int, other: int) -> int:
+        # Negamax from the point of view of the player about to move; the
+        # table is keyed by (X, O), so swap back depending on who moves.
+        x_to_move = bin(mover).count('1') == bin(other).count('1')
+        key = _key(mover, other) if x_to_move else _key(other, mover)
+        entry = table.get(key)
+        if entry is not None:
+            return entry[0]
+
+        if TTT_WINNING[other]:
+            value, best = -1, 0
+        elif mover | other == TTT_FULL_BOARD:
+            value, best = 0, 0
+        else:
+            value, best = -2, 0
+            for cell in iter_moves(legal_moves(mover, other)):
+                move = 1 << cell
+                score = -solve(other, mover | move)
+                if score > value:
+                    value, best = score, move
+                elif score == value:
+                    best |= move
+        table[key] = (value, best)
+        return value
+
+    solve(0, 0)
+    return table
+
+
+def position_value(x_bits: int, o_bits: int) -> int:
+    """+1 win, 0 draw, -1 loss for the player to move, under perfect play"""
+    return solved_positions()[_key(x_bits, o_bits)][0]
+
+
+def best_moves(x_bits: int, o_bits: int) -> int:
+    """Bitmask of the optimal moves for the player to move"""
+    return solved_positions()[_key(x_bits, o_bits)][1]
+
+
+def choose_move(x_bits: int, o_bits: int, difficulty: str = "🤖 Unbeatable", rng=random) -> int:
+    """Pick the computer's move (cell 0-8) for the given difficulty"""
+    if rng.random() < DIFFICULTY_RANDOMNESS[difficulty]:
+        candidates = legal_moves(x_bits, o_bits)
+    else:
+        candidates = best_moves(x_bits, o_bits)
+    if not candidates:
+        raise ValueError("no legal moves left")
+    return rng.choice(list(iter_moves(candidates)))
+
+
+def computer_turn(state: TicTacToeState, difficulty: str = "🤖 Unbeatable", rng=random):
+    """Play the computer's move if it is the computer's turn.
+
+    Returns the ``TicTacToeResult`` of the move, or None when nothing was
+    played (game over or human to move).
+    """
+    if state.game_over or state.current_player != state.computer_player:
+        return None
+    return ttt_step(state, choose_move(state.x_bits, state.o_bits, difficulty, rng))
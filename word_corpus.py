@@ -0,0 +1,145 @@
+"""
+Word Corpus
+===========
+Dictionary-backed word source for the word scramble game.
+
+A word list (one word per line, most common first) is loaded once per
+process into a compact, shared index:
+
+* all words live in one string, sorted by anagram signature (the word's
+  letters in sorted order), with an ``array`` of start offsets;
+* a dict maps each signature to its group of words, so checking whether a
+  guess is a valid anagram is a single lookup;
+* word indices are bucketed by length and frequency band, and difficulty
+  levels are defined on top of those buckets.
+
+A 100k-word dictionary takes a few MB this way instead of one Python
+object graph per session.
+"""
+
+import os
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from collections.abc import Sequence
+from typing import Iterable, Optional
+
+DICTIONARY_ENV = "MINIGAMES_DICTIONARY"
+DEFAULT_DICTIONARY = Path(__file__).parent / "data" / "dictionary.txt"
+
+# Frequency bands, as fractions of the frequency-ordered word list
+FREQUENCY_BANDS = (("common", 0.2), ("regular", 0.6), ("rare", 1.0))
+
+# difficulty -> (min length, max length, allowed frequency bands)
+DIFFICULTY_RULES = {
+    "easy": (3, 4, ("common", "regular")),
+    "medium": (5, 8, ("common", "regular")),
+    "hard": (9, 99, ("common", "regular", "rare")),
+}
+
+
+def signature(word: str) -> str:
+    """Anagram signature: the word's letters in sorted order"""
+    return ''.join(sorted(word))
+
+
+class WordPool(Sequence):
+    """Read-only sequence view of the words in one difficulty pool"""
+
+    def __init__(self, corpus: 'WordCorpus', indices: array):
+        self._corpus = corpus
+        self._indices = indices
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._corpus.word(index) for index in self._indices[position]]
+        return self._corpus.word(self._indices[position])
+
+
+class WordCorpus:
+    """Signature-indexed, compactly encoded dictionary"""
+
+    def __init__(self, words: Iterable[str]):
+        # Deduplicate, keeping the first (most frequent) occurrence
+        ranked = {}
+        for word in words:
+            word = word.strip().lower()
+            if len(word) > 1 and word.isalpha() and word not in ranked:
+                ranked[word] = len(ranked)
+        n_words = len(ranked)
+
+        order = sorted(ranked, key=lambda word: (signature(word), word))
+        self._blob = ''.join(order)
+        self._starts = array('I', [0])
+        self._rank = array('I')
+        self._groups = {}
+        for index, word in enumerate(order):
+            self._starts.append(self._starts[-1] + len(word))
+            self._rank.append(ranked[word])
+            sig = signature(word)
+            first, _ = self._groups.get(sig, (index, index))
+            self._groups[sig] = (first, index + 1)
+
+        # (length, band) -> indices of the words in that bucket
+        self._buckets = {}
+        for index, word_rank in enumerate(self._rank):
+            length = self._starts[index + 1] - self._starts[index]
+            band = next(name for name, limit in FREQUENCY_BANDS if word_rank < limit * n_words)
+            self._buckets.setdefault((length, band), array('I')).append(index)
+        self._pools = {}
+
+    def __len__(self):
+        return len(self._rank)
+
+    def __contains__(self, word: str):
+        word = word.lower()
+        return word in self.anagrams(word)
+
+    def word(self, index: int) -> str:
+        return self._blob[self._starts[index]:self._starts[index + 1]]
+
+    def anagrams(self, word: str):
+        """Every dictionary word made of exactly the letters of ``word``"""
+        group = self._groups.get(signature(word.lower()))
+        if group is None:
+            return ()
+        return tuple(self.word(index) for index in range(*group))
+
+    def is_valid_answer(self, guess: str, answer: str) -> bool:
+        """True if ``guess`` is ``answer`` or another dictionary anagram of it"""
+        guess = guess.strip().lower()
+        answer = answer.lower()
+        if guess == answer:
+            return True
+        return len(guess) == len(answer) and signature(guess) == signature(answer) and guess in self
+
+    def pool(self, difficulty: str) -> array:
+        """Indices of the words for a difficulty level"""
+        pool = self._pools.get(difficulty)
+        if pool is None:
+            min_length, max_length, bands = DIFFICULTY_RULES[difficulty]
+            pool = array('I')
+            for (length, band), indices in self._buckets.items():
+                if min_length <= length <= max_length and band in bands:
+                    pool.extend(indices)
+            self._pools[difficulty] = pool
+        return pool
+
+    def words(self, difficulty: str) -> WordPool:
+        """The words for a difficulty level, as a sequence (works with ``rng.choice``)"""
+        return WordPool(self, self.pool(difficulty))
+
+    @classmethod
+    def from_file(cls, path) -> 'WordCorpus':
+        """Load a word list; ``#`` lines and anything after a tab are ignored"""
+        with open(path, encoding="utf-8") as f:
+            return cls(line.split('\t', 1)[0] for line in f if not line.startswith('#'))
+
+
+@lru_cache(maxsize=None)
+def load_corpus(path: Optional[str] = None) -> WordCorpus:
+    """The shared corpus for ``path`` (default: $MINIGAMES_DICTIONARY or the bundled list)"""
+    return WordCorpus.from_file(path or os.environ.get(DICTIONARY_ENV) or DEFAULT_DICTIONARY)